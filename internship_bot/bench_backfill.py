@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from event_store import EventStore
+from processor import Processor
+
+# Usage: python bench_backfill.py [--records 1000000] [--workers 1 2 4 8]
+# Backfill throughput of synthetic raw records into an empty store, single-process
+# (process_stream) and on process pools of growing size (Processor.backfill).
+
+ROLES = ["Software Engineering", "Data Science", "Machine Learning", "Backend", "Frontend", "Mechanical Engineering",
+         "Research", "Product Design", "Cloud Infrastructure", "Security", "Embedded Systems", "Quantitative Research"]
+LEVELS = ["Intern", "Internship", "Summer Intern", "Intern (Summer 2025)", "Co-op"]
+LOCATIONS = ["Berlin, Germany", "Remote", "New York, NY, United States", "London, UK", "Toronto, Canada",
+             "Zurich, Switzerland", "Bangalore, India", "Paris, France", "Remote - US", "Amsterdam, NL"]
+SOURCES = ["LinkedIn", "Remotive", "Greenhouse", "Lever", "SmartRecruiters"]
+
+
+def records(n, seed=0):
+    rnd = random.Random(seed)
+    for k in range(n):
+        company = f"Company {rnd.randrange(n // 4 + 1)}"
+        yield {
+            'title': f"{rnd.choice(ROLES)} {rnd.choice(LEVELS)}",
+            'company': company,
+            'location': rnd.choice(LOCATIONS),
+            'link': f"https://jobs.example.com/{company.replace(' ', '-').lower()}/{k}?utm_source=feed",
+            'source': rnd.choice(SOURCES),
+            'tags': rnd.sample(["python", "ml", "react", "cad", "research", "cloud"], 2),
+        }
+
+
+def run(n, workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EventStore(os.path.join(tmp, 'snapshot.json'), os.path.join(tmp, 'events.jsonl'),
+                           os.path.join(tmp, 'legacy.json'))
+        processor = Processor(store)
+        start = time.perf_counter()
+        if workers == 0:
+            with processor.session():
+                added = processor.process_stream(records(n), checkpoint_every=n)
+        else:
+            added = processor.backfill(records(n), workers=workers)
+        elapsed = time.perf_counter() - start
+        store.close()
+    return elapsed, added
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--records', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    print(f"{args.records:,} records, {os.cpu_count()} cores")
+    print(f"{'mode':>16} {'time':>9} {'records/s':>11} {'speedup':>8} {'added':>9}")
+    baseline = None
+    for workers in [0] + args.workers:
+        elapsed, added = run(args.records, workers)
+        baseline = baseline or elapsed
+        mode = "process_stream" if workers == 0 else f"backfill x{workers}"
+        print(f"{mode:>16} {elapsed:8.1f}s {args.records / elapsed:>11,.0f} {baseline / elapsed:7.2f}x {added:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import json
+import os
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from src.bulk_import import BulkImporter
+from src.database import Database
+
+# Usage: python bench_bulk_import.py [--rows 1000000]
+# Merges a synthetic SQLite store and an overlapping JSON-lines dump into a new
+# database and reports throughput and peak memory.
+
+ROLES = ["Software Engineering", "Data Science", "Machine Learning", "Backend", "Frontend", "Research"]
+LOCATIONS = ["Berlin, Germany", "Remote", "New York, NY", "London, UK", "Toronto, Canada", "Bangalore, India"]
+
+
+def make_sources(tmp, rows):
+    rnd = random.Random(0)
+    db_path = os.path.join(tmp, 'old.db')
+    Database(db_path).engine.dispose()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO internships (title, company, location, link, source, country, field) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((f"{rnd.choice(ROLES)} Intern", f"Company {k}", rnd.choice(LOCATIONS),
+              f"https://jobs.example.com/{k}", 'LinkedIn', 'Other', 'Computer Science') for k in range(rows // 2)))
+    conn.close()
+
+    # Half overlaps the database (same links with tracking parameters), half is new
+    dump_path = os.path.join(tmp, 'dump.jsonl')
+    with open(dump_path, 'w') as f:
+        for k in range(rows // 4, rows // 4 + rows // 2):
+            f.write(json.dumps({'title': f"{rnd.choice(ROLES)} Intern", 'company': f"Company {k}",
+                                'location': rnd.choice(LOCATIONS), 'link': f"https://jobs.example.com/{k}/?utm_source=x",
+                                'source': 'Remotive'}) + '\n')
+    return [db_path, dump_path]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = make_sources(tmp, args.rows)
+        start = time.perf_counter()
+        importer = BulkImporter(os.path.join(tmp, 'merged.db'))
+        for path in sources:
+            importer.import_source(path)
+        elapsed = time.perf_counter() - start
+        print(f"{importer.read:,} rows read, {importer.written:,} written in {elapsed:.1f}s "
+              f"({importer.read / elapsed:,.0f} rows/s), peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+        importer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+
+import os
+import random
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+
+from dateutil import parser
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+import utils
+
+# Usage: python bench_dates.py [count]
+# Parses a realistic mix of scraped date strings with the old dateutil-only function
+# and the tiered parser, cold (memo cleared) and warm.
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+def legacy_parse_date(date_str):
+    """utils.parse_date before the fast path."""
+    if not date_str or date_str == "N/A" or date_str == "Freshly Posted":
+        if date_str == "Freshly Posted":
+            return datetime.now()
+        return None
+    try:
+        dt = parser.parse(date_str)
+        if dt.tzinfo:
+            dt = dt.replace(tzinfo=None)
+        return dt
+    except Exception:
+        return None
+
+
+def tiered_no_memo(date_str):
+    if not date_str or date_str in ("N/A", "Freshly Posted"):
+        return utils.parse_date(date_str)
+    return utils._parse_cached.__wrapped__(date_str)
+
+
+def make_mix(n, distinct=3000, seed=7):
+    rnd = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    pool = []
+    for _ in range(distinct):
+        dt = base + timedelta(minutes=rnd.randrange(0, 400 * 24 * 60))
+        kind = rnd.random()
+        if kind < 0.35:    # Remotive publication_date
+            pool.append(dt.strftime('%Y-%m-%dT%H:%M:%S'))
+        elif kind < 0.55:  # CERN releasedDate
+            pool.append(dt.strftime('%Y-%m-%dT%H:%M:%S.') + f"{rnd.randrange(1000):03d}Z")
+        elif kind < 0.70:  # LinkedIn datetime attribute
+            pool.append(dt.strftime('%Y-%m-%d'))
+        elif kind < 0.95:  # RSS pubDate
+            pool.append(dt.strftime('%a, %d %b %Y %H:%M:%S ') + rnd.choice(['+0000', 'GMT', '-0500']))
+        else:              # free text that needs dateutil
+            pool.append(dt.strftime('%B %d, %Y'))
+    pool += ["Freshly Posted", "N/A", ""]
+    return [rnd.choice(pool) for _ in range(n)]
+
+
+def timed(label, func, dates):
+    start = time.perf_counter()
+    for d in dates:
+        func(d)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:7.2f}s  {elapsed / len(dates) * 1e6:7.2f} us/date")
+
+
+def main():
+    dates = make_mix(N)
+    print(f"{N:,} dates, {len(set(dates)):,} distinct")
+    warnings.simplefilter('ignore')
+    timed("dateutil only (legacy)", legacy_parse_date, dates)
+
+    timed("tiered, no memo", tiered_no_memo, dates)
+
+    utils._parse_cached.cache_clear()
+    timed("tiered + memo", utils.parse_date, dates)
+    print(f"  {utils._parse_cached.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from processor import Processor
+from dedupe import DedupeIndex
+
+# Usage: python bench_dedupe.py [--legacy]
+# Times ingesting one batch of scraped items against stores of growing size.
+# --legacy also times the previous any(...) apply_link scan (slow past ~10k stored).
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+BATCH = 1_000
+
+
+def stored_items(n, keyed=True):
+    # Stored records carry the link_key written by earlier runs; keyed=False is a pre-index data file
+    items = [{'id': f"{i:032x}", 'apply_link': f"https://example.com/jobs/{i}?utm_source=feed"} for i in range(n)]
+    if keyed:
+        for i, item in enumerate(items):
+            item['link_key'] = f"https://example.com/jobs/{i}"
+    return items
+
+
+def raw_batch(n):
+    # Half the batch repeats stored links (with different tracking params), half is new
+    return [{'title': f"Software Intern {i}", 'company': "Acme", 'location': "Berlin, Germany",
+             'link': f"https://example.com/jobs/{i if i % 2 else n + i}/?utm_source=rss"} for i in range(BATCH)]
+
+
+def legacy_merge(processor, raw, current_data, current_ids):
+    normalized = processor.normalize_internship(raw)
+    if normalized['id'] not in current_ids:
+        if not any(x['apply_link'] == normalized['apply_link'] for x in current_data):
+            current_data.append(normalized)
+            current_ids.add(normalized['id'])
+            return 1
+    return 0
+
+
+def main():
+    legacy = '--legacy' in sys.argv
+
+    print(f"{'stored':>10} {'first build':>12} {'index build':>12} {'ingest ' + str(BATCH):>14} {'per item':>10} {'added':>6}"
+          + (f" {'legacy ingest':>14}" if legacy else ""))
+    for size in SIZES:
+        # Fresh store per size; new items are appended to its event log as in a real run
+        os.chdir(tempfile.mkdtemp())
+        processor = Processor()
+        processor._ensure_indexes()
+        batch = raw_batch(size)
+
+        data = stored_items(size)
+        start = time.perf_counter()
+        index = DedupeIndex(data)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        added = sum(processor._merge(raw, index) for raw in batch)
+        ingest = time.perf_counter() - start
+        del data, index
+
+        # One-off cost on a data file written before link_key existed
+        data = stored_items(size, keyed=False)
+        start = time.perf_counter()
+        DedupeIndex(data)
+        first_build = time.perf_counter() - start
+        del data
+
+        line = f"{size:>10,} {first_build * 1000:10.1f}ms {build * 1000:10.1f}ms {ingest * 1000:12.1f}ms {ingest / BATCH * 1e6:8.1f}us {added:>6}"
+        if legacy and size <= 100_000:
+            data = stored_items(size)
+            ids = {item['id'] for item in data}
+            start = time.perf_counter()
+            sum(legacy_merge(processor, raw, data, ids) for raw in batch)
+            line += f" {(time.perf_counter() - start) * 1000:12.1f}ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from gazetteer import Gazetteer, SHORT_NAMES
+
+# Usage: python bench_gazetteer.py [locations]
+# Resolves a stream of scraped-looking locations (a few hundred distinct strings, repeated
+# the way real listings repeat) and reports throughput per million locations.
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+# The per-alias regex loop is slow; time it on a sample and scale up
+LEGACY_SAMPLE = 50_000
+
+CITIES = ["Geneva", "Berlin", "London", "Paris", "Madrid", "Dublin", "Zurich", "Amsterdam", "Munich",
+          "New York", "San Francisco", "Toronto", "Sydney", "Bangalore", "Mumbai", "Austin", "Lagos"]
+SUFFIXES = ["ch", "de", "UK", "France", "Spain", "Ireland", "Switzerland", "Netherlands", "Germany",
+            "NY, USA", "CA, United States", "Canada", "Australia", "India", "TX, US", "Nigeria", ""]
+
+
+def make_locations(n, seed=1):
+    rnd = random.Random(seed)
+    pool = [f"{c}, {s}".strip(', ') for c in CITIES for s in SUFFIXES]
+    pool += ["Remote", "Remote in US", "Work from home", "Hybrid - Remote, Europe", "Anywhere"]
+    return [rnd.choice(pool) for _ in range(n)]
+
+
+def legacy_resolve(location):
+    """The loop previously inlined in Processor.normalize_internship."""
+    country_map = {
+        'united states': 'USA', 'usa': 'USA', 'us': 'USA',
+        'united kingdom': 'UK', 'uk': 'UK', 'great britain': 'UK', 'gb': 'UK', 'london': 'UK',
+        'canada': 'Canada', 'ca': 'Canada',
+        'australia': 'Australia', 'au': 'Australia',
+        'germany': 'Germany', 'de': 'Germany', 'berlin': 'Germany', 'munich': 'Germany',
+        'france': 'France', 'fr': 'France', 'paris': 'France',
+        'switzerland': 'Switzerland', 'ch': 'Switzerland', 'geneva': 'Switzerland', 'zurich': 'Switzerland',
+        'netherlands': 'Netherlands', 'nl': 'Netherlands', 'amsterdam': 'Netherlands',
+        'spain': 'Spain', 'es': 'Spain', 'madrid': 'Spain', 'barcelona': 'Spain',
+        'italy': 'Italy', 'it': 'Italy',
+        'sweden': 'Sweden', 'se': 'Sweden',
+        'ireland': 'Ireland', 'ie': 'Ireland', 'dublin': 'Ireland',
+        'austria': 'Austria', 'at': 'Austria',
+        'belgium': 'Belgium', 'be': 'Belgium',
+        'portugal': 'Portugal', 'pt': 'Portugal',
+        'poland': 'Poland', 'pl': 'Poland',
+        'denmark': 'Denmark', 'dk': 'Denmark',
+        'norway': 'Norway', 'no': 'Norway',
+        'finland': 'Finland', 'fi': 'Finland',
+        'india': 'India', 'in': 'India'
+    }
+    loc_lower = location.lower()
+    for key, val in country_map.items():
+        if re.search(r'\b' + re.escape(key) + r'\b', loc_lower):
+            return val
+    return "Remote"
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    per_million = elapsed / count * 1_000_000
+    print(f"  {label:<34} {per_million:8.2f} s / 1M   {count / elapsed:12,.0f} loc/s")
+
+
+def main():
+    locations = make_locations(N)
+    sample = locations[:LEGACY_SAMPLE]
+    print(f"{N:,} locations, {len(set(locations))} distinct")
+
+    timed("legacy per-alias regex loop", lambda: [legacy_resolve(l) for l in sample], len(sample))
+
+    uncached = Gazetteer(cache_size=0)
+    timed("compiled alternation, no cache", lambda: [uncached.resolve(l) for l in locations], N)
+
+    cached = Gazetteer()
+    timed("compiled alternation + LRU", lambda: [cached.resolve(l) for l in locations], N)
+
+    batch = Gazetteer()
+    timed("resolve_many", lambda: batch.resolve_many(locations), N)
+    print(f"  LRU: {cached.cache_info()}")
+
+    # Not expected to be zero: the legacy loop read lowercase words ("in", "de") as codes and
+    # knew fewer cities. tests/test_gazetteer.py holds the cases that matter.
+    mismatches = [l for l in set(sample) if legacy_resolve(l) != SHORT_NAMES.get(cached.resolve(l), "Remote")]
+    print(f"  resolved differently from legacy: {len(mismatches)} {mismatches[:5]}")
+
+
+if __name__ == "__main__":
+    main()
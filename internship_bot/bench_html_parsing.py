@@ -0,0 +1,45 @@
+
+import sys
+import os
+import time
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from html_parsing import extract_cards, available_backends, INTERNSHALA
+
+# Usage: python bench_html_parsing.py [page.html ...]   (defaults to debug_page.html)
+ROUNDS = 20
+
+
+def full_soup_baseline(content):
+    """The previous approach: build the whole tree with html.parser, then find_all."""
+    soup = BeautifulSoup(content, 'html.parser')
+    return soup.find_all('div', class_='individual_internship')
+
+
+def bench(func, content):
+    func(content)  # warm up
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(content)
+    return (time.perf_counter() - start) / ROUNDS * 1000, len(result)
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    pages = sys.argv[1:] or [os.path.join(here, 'debug_page.html')]
+
+    for path in pages:
+        with open(path, 'rb') as f:
+            content = f.read()
+        print(f"{os.path.basename(path)} ({len(content) / 1024:.0f} KiB, {ROUNDS} rounds)")
+
+        ms, cards = bench(full_soup_baseline, content)
+        print(f"  {'full soup (baseline)':<22} {ms:8.2f} ms/page  {cards} cards")
+        for backend in available_backends():
+            ms, cards = bench(lambda c: extract_cards(c, INTERNSHALA, backend), content)
+            print(f"  {backend:<22} {ms:8.2f} ms/page  {cards} cards")
+
+
+if __name__ == "__main__":
+    main()
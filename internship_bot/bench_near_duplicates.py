@@ -0,0 +1,47 @@
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from near_duplicates import NearDuplicateIndex, minhash
+
+# Usage: python bench_near_duplicates.py
+# Time to check and index one new posting against histories of growing size.
+SIZES = [1_000, 10_000, 100_000]
+BATCH = 500
+
+ROLES = ["Software Engineering", "Data Science", "Machine Learning", "Backend", "Frontend", "Mechanical Engineering",
+         "Research", "Product Design", "Cloud Infrastructure", "Security", "Embedded Systems", "Quantitative Research"]
+LEVELS = ["Intern", "Internship", "Summer Intern", "Intern (Summer 2025)", "Co-op"]
+
+
+def postings(n, seed):
+    rnd = random.Random(seed)
+    return [(f"{rnd.choice(ROLES)} {rnd.choice(LEVELS)}", f"Company {rnd.randrange(n)}") for _ in range(n)]
+
+
+def main():
+    print(f"{'history':>10} {'build':>10} {'check+add':>12} {'duplicates':>11}")
+    for size in SIZES:
+        index = NearDuplicateIndex()
+        start = time.perf_counter()
+        for key, (title, company) in enumerate(postings(size, seed=size)):
+            index.add(str(key), title, company, minhash(title, company))
+        build = time.perf_counter() - start
+
+        found = 0
+        start = time.perf_counter()
+        for key, (title, company) in enumerate(postings(BATCH, seed=1)):
+            signature = minhash(title, company)
+            if index.find(title, company, signature) is not None:
+                found += 1
+            else:
+                index.add(f"new{key}", title, company, signature)
+        per_item = (time.perf_counter() - start) / BATCH
+        print(f"{size:>10,} {build:9.1f}s {per_item * 1e6:10.0f}us {found:>11}")
+
+
+if __name__ == "__main__":
+    main()
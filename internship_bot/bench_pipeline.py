@@ -0,0 +1,104 @@
+import argparse
+import os
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(HERE)
+from src.event_store import EventStore, SNAPSHOT_FILE, LOG_FILE, LEGACY_FILE
+
+# Usage:
+#   python bench_pipeline.py record              # live run, every exchange saved to the cassettes
+#   python bench_pipeline.py replay [--rounds N] # offline run against the cassettes
+# Each round runs the real entry points, src/main_pipeline.py and src/main.py, as the
+# scheduled workflow does, in a fresh working directory so no data, cache or state carries
+# over. Their HttpClients pick the cassette up from HTTP_CASSETTE, and the Telegram API is
+# always stubbed, so nothing is ever posted.
+DEFAULT_CASSETTE_DIR = os.path.join(HERE, 'data', 'cassettes')
+PIPELINES = [('content', 'main_pipeline.py'), ('bot', 'main.py')]
+# Logged by the runner as each source completes
+SOURCE_DONE = re.compile(r' - INFO - (.+): Found (\d+) items in ([\d.]+)s$')
+
+
+def cassette_path(cassette_dir, script):
+    return os.path.join(cassette_dir, script.replace('.py', '.jsonl.gz'))
+
+
+def run_pipeline(script, workdir, cassette, mode, latency=0.0):
+    """Runs one entry point against `cassette`; returns (seconds, its log)."""
+    env = dict(os.environ,
+               BOT_TOKEN='bench-token', CHANNEL_ID='@bench',
+               HTTP_CASSETTE=cassette, HTTP_CASSETTE_MODE=mode, HTTP_REPLAY_LATENCY=str(latency))
+    if mode == 'replay':
+        # Recorded pages and a stubbed Telegram need no pacing
+        env.update(CRAWL_REQUESTS_PER_SECOND='inf', POST_DELAY='0')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(HERE, 'src', script)], cwd=workdir, env=env,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} exited with {result.returncode}:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def stored_counts(workdir):
+    """Rows the bot pipeline stored and items the content pipeline kept and posted."""
+    with sqlite3.connect(os.path.join(workdir, 'internships.db')) as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM internships").fetchone()[0]
+    store = EventStore(snapshot_file=os.path.join(workdir, SNAPSHOT_FILE), log_file=os.path.join(workdir, LOG_FILE),
+                       legacy_file=os.path.join(workdir, LEGACY_FILE))
+    store.close()
+    return {'db rows': rows, 'items kept': len(store.items),
+            'posted': sum(1 for item in store.items if item.get('posted_to_telegram'))}
+
+
+def run_round(cassette_dir, mode, latency=0.0):
+    """Both pipelines in a fresh working directory; returns per-stage seconds and stored counts."""
+    timings = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, script in PIPELINES:
+            elapsed, log = run_pipeline(script, workdir, cassette_path(cassette_dir, script), mode, latency)
+            timings[name] = elapsed
+            for line in log.splitlines():
+                match = SOURCE_DONE.search(line)
+                if match:
+                    timings[f"{name}: {match.group(1)} done at"] = float(match.group(3))
+        counts = stored_counts(workdir)
+    timings['total'] = sum(timings[name] for name, _ in PIPELINES)
+    return timings, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay full pipeline runs and report per-stage timings")
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('--cassette-dir', default=DEFAULT_CASSETTE_DIR)
+    parser.add_argument('--rounds', type=int, default=5, help="Replay rounds (record always runs once)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Replay with recorded response times scaled by this factor")
+    args = parser.parse_args()
+
+    if args.mode == 'record':
+        os.makedirs(args.cassette_dir, exist_ok=True)
+        timings, counts = run_round(args.cassette_dir, 'record')
+        rounds = [timings]
+        print(f"Recorded to {args.cassette_dir}: {counts}")
+    else:
+        rounds = []
+        for _ in range(args.rounds):
+            timings, counts = run_round(args.cassette_dir, 'replay', args.latency)
+            rounds.append(timings)
+        print(f"Replayed {args.rounds} rounds from {args.cassette_dir}: {counts}")
+
+    # Per-source lines are when the runner saw each source finish, from the start of its scrape phase
+    print(f"  {'stage':<44} {'median':>10} {'min':>10}")
+    for name in [n for n in rounds[0] if n != 'total'] + ['total']:
+        samples = [r.get(name, 0.0) * 1000 for r in rounds]
+        print(f"  {name:<44} {statistics.median(samples):8.1f}ms {min(samples):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from src.database import Database, country_code
+from src.search_cache import SearchCache
+from src.filters import COUNTRIES, STEM_FIELDS
+
+# Usage: python bench_search.py [--rows 1000000]
+# search_internships latency on a large table, with the EXPLAIN QUERY PLAN of each query
+# shape. Fails if any of them scans the table or sorts instead of reading an index.
+# Then full_text_search against the LIKE scan it replaces. All of these bypass the result
+# cache; the 'cached' column is the same query answered from it.
+
+QUERIES = [('United States', 'Computer Science'), ('Germany', 'All'), ('All', 'Data Science & AI'), ('All', 'All')]
+# Common words (LIKE's best case: it stops at the first few newest rows) and rare ones
+TEXT_QUERIES = ['rust embedded berlin', 'machine learning', 'intern', 'company 4242', 'haskell']
+ROLES = ["Software Engineering", "Data Science", "Machine Learning", "Backend", "Frontend", "Robotics", "Rust Embedded",
+         "Research", "Product Design", "Cloud Infrastructure", "Security", "Quantum Computing", "Bioinformatics"]
+CITIES = ["Berlin, Germany", "Remote", "New York, NY", "London, UK", "Toronto, Canada", "Zurich, Switzerland", "Paris"]
+TAGS = ["python", "rust", "c++", "react", "aws", "pytorch", "cad", "linux", "sql", "kubernetes"]
+REPEAT = 200
+# The unindexed query scans the whole table; a few runs are enough
+LEGACY_REPEAT = 5
+
+
+def populate(path, rows):
+    rnd = random.Random(0)
+    Database(path).engine.dispose()
+    countries = COUNTRIES + ['Other', 'Unknown']
+    fields = list(STEM_FIELDS) + ['Other']
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO internships (title, company, location, link, date_posted, source, country, country_code, field, tags) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((f"{rnd.choice(ROLES)} Intern", f"Company {k % 5000}", rnd.choice(CITIES), f"https://jobs.example.com/{k}",
+              (start + timedelta(minutes=rnd.randrange(10**6))).strftime('%Y-%m-%d %H:%M:%S.%f'), 'Bench',
+              country, country_code(country), rnd.choice(fields), ', '.join(rnd.sample(TAGS, 2)))
+             for k, country in ((k, rnd.choice(countries)) for k in range(rows))))
+    conn.close()
+
+
+def legacy_search(conn, country, field, limit=5):
+    """The query search_internships ran before country_code and its indexes: a substring
+    match on the name over the whole table, then a sort (NOT INDEXED stands in for the old schema)."""
+    sql = "SELECT * FROM internships NOT INDEXED WHERE 1"
+    params = []
+    if country != 'All':
+        sql += " AND country LIKE ?"
+        params.append(f'%{country}%')
+    if field != 'All':
+        sql += " AND field = ?"
+        params.append(field)
+    return conn.execute(sql + " ORDER BY date_posted DESC LIMIT ?", params + [limit]).fetchall()
+
+
+def like_search(conn, query, limit=5):
+    """Keyword search without the full-text index: every word as a substring of any column."""
+    sql = "SELECT * FROM internships WHERE 1"
+    params = []
+    for word in query.split():
+        sql += " AND (title || ' ' || company || ' ' || location || ' ' || COALESCE(tags, '')) LIKE ?"
+        params.append(f'%{word}%')
+    return conn.execute(sql + " ORDER BY date_posted DESC LIMIT ?", params + [limit]).fetchall()
+
+
+def timed(repeat, func, *args):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'search.db')
+        start = time.perf_counter()
+        populate(path, args.rows)
+        print(f"{args.rows:,} rows loaded in {time.perf_counter() - start:.1f}s")
+        db = Database(path, search_cache=SearchCache(max_entries=0))
+        cached_db = Database(path)
+        conn = sqlite3.connect(path)
+
+        failed = False
+        print(f"{'country':>14} {'field':>18} {'indexed':>10} {'cached':>10} {'no index':>10}  plan")
+        for country, field in QUERIES:
+            plan = db.explain_search(country, field)
+            # Every step must read an index; a SCAN of the bare table or a temp B-tree sort is a regression
+            ok = all('USING INDEX' in step or 'USING COVERING INDEX' in step for step in plan)
+            failed |= not ok
+            indexed = timed(REPEAT, db.search_internships, country, field)
+            cached = timed(REPEAT, cached_db.search_internships, country, field)
+            legacy = timed(LEGACY_REPEAT, legacy_search, conn, country, field)
+            print(f"{country:>14} {field:>18} {indexed * 1e3:8.2f}ms {cached * 1e3:8.2f}ms {legacy * 1e3:8.2f}ms  "
+                  f"{'; '.join(plan)}{'' if ok else '  <-- NOT INDEXED'}")
+
+        print(f"\n{'keywords':>33} {'fts5':>10} {'like':>10} {'hits':>5}")
+        for query in TEXT_QUERIES:
+            fts = timed(REPEAT, db.full_text_search, query)
+            like = timed(LEGACY_REPEAT, like_search, conn, query)
+            print(f"{query:>33} {fts * 1e3:8.2f}ms {like * 1e3:8.2f}ms {len(db.full_text_search(query)):>5}")
+        stats = cached_db.cache_stats()
+        print(f"\nresult cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%})")
+        conn.close()
+        cached_db.engine.dispose()
+        db.engine.dispose()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Raw records per worker task: large enough that pickling and scheduling are noise
+CHUNK_SIZE = 2000
+# Tasks queued per worker, so workers never wait on the parent but the input is not read ahead unboundedly
+PREFETCH = 2
+# Progress is logged every this many records
+LOG_EVERY = 100_000
+READ_SIZE = 1 << 16
+
+
+def iter_json_array(path: str, key: str = None) -> Iterator:
+    """
+    Streams the elements (objects or strings) of the JSON array that is the whole file,
+    or the `key` member of a top-level object, decoding one element at a time instead of
+    loading the file, so memory stays flat however large the dump.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf, pos, eof = '', 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            data = f.read(READ_SIZE)
+            eof = not data
+            buf, pos = buf[pos:] + data, 0
+            return not eof
+
+        marker = '[' if key is None else json.dumps(key)
+        while (start := buf.find(marker)) < 0:
+            if not fill():
+                raise ValueError(f"{path}: no JSON array{f' under {key!r}' if key else ''}")
+        pos = start + len(marker)
+        if key is not None:
+            while (start := buf.find('[', pos)) < 0:
+                if not fill():
+                    raise ValueError(f"{path}: no JSON array under {key!r}")
+            pos = start + 1
+
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buf):
+                if not fill():
+                    raise ValueError(f"{path}: unterminated JSON array")
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # The element runs past the buffer
+                if not fill():
+                    raise
+                continue
+            yield value
+            pos = end
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Raw records from a dump: JSON lines or a single JSON array, both streamed."""
+    if not path.endswith('.jsonl'):
+        yield from iter_json_array(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable record at {path}:{line_no}")
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def warm_worker():
+    """
+    Pool initializer: compiles the gazetteer, field classifier and date patterns once
+    per worker process (they are built at import), instead of once per task.
+    """
+    try:
+        from gazetteer import resolve_country
+        from classifier import classify
+        from utils import parse_date
+    except ImportError:
+        from src.gazetteer import resolve_country
+        from src.classifier import classify
+        from src.utils import parse_date
+    resolve_country('Remote')
+    classify('Software Engineering Intern')
+    parse_date('2024-01-01T00:00:00Z')
+
+
+def map_chunks(func: Callable[[list], List], items: Iterable, workers: int = None,
+               chunk_size: int = CHUNK_SIZE, initializer: Callable = warm_worker) -> Iterator:
+    """
+    Runs `func` over `items` in chunks of `chunk_size` on a pool of `workers` processes
+    (default: one per core) and yields its results one by one, in input order, as each
+    chunk finishes. At most PREFETCH chunks per worker are in flight, so memory stays
+    bounded however long the input is. `func` must be a module-level function.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(items, chunk_size)
+    done = 0
+    start = time.perf_counter()
+
+    def progress(results):
+        nonlocal done
+        before, done = done, done + len(results)
+        if done // LOG_EVERY > before // LOG_EVERY:
+            logger.info(f"Backfill: {done} results ({done / (time.perf_counter() - start):.0f}/s)")
+        return results
+
+    if workers == 1:
+        # No pool to pay for; same results, same order
+        if initializer is not None:
+            initializer()
+        for chunk in chunks:
+            yield from progress(func(chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= workers * PREFETCH:
+                yield from progress(pending.popleft().result())
+        while pending:
+            yield from progress(pending.popleft().result())
@@ -2,11 +2,16 @@
 import requests
 import logging
 import os
+try:
+    from http_client import HttpClient, get_default_client
+except ImportError:
+    from src.http_client import HttpClient, get_default_client
 
 logger = logging.getLogger(__name__)
 
 class TelegramBot:
-    def __init__(self, token: str, channel_id: str):
+    def __init__(self, token: str, channel_id: str, client: HttpClient = None):
+        self.client = client or get_default_client()
         self.token = token
         self.channel_id = channel_id
         self.api_url = f"https://api.telegram.org/bot{self.token}/sendMessage"
@@ -31,7 +36,7 @@ class TelegramBot:
             }
         
         try:
-            response = requests.post(self.api_url, json=payload)
+            response = self.client.post(self.api_url, json=payload)
             response.raise_for_status()
             logger.info("Message sent successfully.")
         except requests.exceptions.HTTPError as e:
@@ -0,0 +1,233 @@
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.backfill import iter_json_array, iter_records, chunked
+from src.database import Database, GENERATION_BUMP, country_code, generation_scopes
+from src.dedupe import canonical_link
+from src.event_store import INSERT
+from src.filters import extract_country, classify_field
+from src.processor import generate_id
+
+logger = logging.getLogger(__name__)
+
+# Rows written per transaction
+BATCH_SIZE = 5000
+# Rows read between progress lines
+LOG_EVERY = 50_000
+# The stores this bot has used, relative to internship_bot/; missing ones are skipped
+DEFAULT_SOURCES = [
+    'internships.db',
+    'src/internships.db',
+    'data/internships.snapshot.json',
+    'data/internships.events.jsonl',
+    'data/internships.json',
+    'history.json',
+]
+# Columns every store has; tags come from items only, country_code is derived from country
+SOURCE_COLUMNS = ('title', 'company', 'location', 'link', 'date_posted', 'source', 'country', 'field', 'created_at')
+COLUMNS = SOURCE_COLUMNS + ('tags', 'country_code')
+# SQLAlchemy's storage format for DateTime columns on SQLite
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).strftime(DATETIME_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def _from_item(item):
+    """A Processor / event-store item as a database row."""
+    location = item.get('location') or 'Unknown'
+    title = item.get('title') or 'N/A'
+    posted_at = _timestamp(item.get('posted_at'))
+    tags = item.get('requirements') or item.get('tags')
+    return {
+        'title': title,
+        'company': item.get('company') or 'N/A',
+        'location': location,
+        'link': item.get('apply_link') or item.get('link'),
+        'date_posted': _timestamp(item.get('date')) or posted_at,
+        'source': item.get('source'),
+        'country': extract_country(location),
+        'field': classify_field(title, tags),
+        'created_at': posted_at,
+        'tags': ', '.join(tags) if tags else None,
+    }
+
+
+def _from_link(link):
+    """A history.json entry: only the link is known, so it goes to seen_links, not internships."""
+    return {'link': link, 'source': 'history'}
+
+
+def _is_bare(row):
+    return 'title' not in row
+
+
+def _read_sqlite(path):
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        available = {row['name'] for row in conn.execute("PRAGMA table_info(internships)")}
+        columns = SOURCE_COLUMNS + (('tags',) if 'tags' in available else ())
+        # A cursor fetches rows as they are iterated, not all at once
+        for row in conn.execute(f"SELECT {', '.join(columns)} FROM internships ORDER BY id"):
+            yield dict(row)
+    finally:
+        conn.close()
+
+
+def read_source(path: str) -> Iterator[Dict]:
+    """Streams the rows of any store this bot has used, recognised by its format."""
+    if path.endswith('.db'):
+        yield from _read_sqlite(path)
+    elif path.endswith('.jsonl'):
+        # The event store's log; plain JSON lines of items work too
+        for record in iter_records(path):
+            if 'op' not in record:
+                yield _from_item(record)
+            elif record['op'] == INSERT:
+                yield _from_item(record['item'])
+    elif path.endswith('.snapshot.json'):
+        for item in iter_json_array(path, key='items'):
+            yield _from_item(item)
+    else:
+        # history.json (a list of links) or a list of items (internships.json)
+        for entry in iter_json_array(path):
+            yield _from_link(entry) if isinstance(entry, str) else _from_item(entry)
+
+
+class BulkImporter:
+    """
+    Merges rows from any number of stores into one SQLite database with the Database schema.
+    Rows are written in transactions of `batch_size`; bare links (history.json) go to
+    seen_links, so they never show up in searches as placeholder rows. A row is dropped if its canonical
+    link or its content id (the Processor's hash of title, company and location) has
+    been seen on another row, in the target or earlier in the import. Bare links are
+    keyed apart: one is dropped if its link is known at all, but never hides a full row,
+    which takes its place in seen_links whichever comes first. Seen keys live in a temporary
+    table of the target connection rather than in Python, so memory stays bounded
+    with millions of rows.
+    """
+
+    def __init__(self, target: str, batch_size: int = BATCH_SIZE):
+        self.target = target
+        self.batch_size = batch_size
+        Database(target).engine.dispose()  # creates the schema
+        self.conn = sqlite3.connect(target)
+        self.conn.execute("PRAGMA temp_store = FILE")
+        self.conn.execute("CREATE TEMP TABLE import_keys (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._insert = (f"INSERT OR IGNORE INTO internships ({', '.join(COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * len(COLUMNS))})")
+        self.read = self.written = self.links_written = 0
+        self._started = time.perf_counter()
+        self._seed()
+
+    def _seed(self):
+        """Registers the keys of rows and links already in the target."""
+        rows = self.conn.execute("SELECT title, company, location, link FROM internships")
+        with self.conn:
+            for row in rows:
+                self._is_new(dict(zip(('title', 'company', 'location', 'link'), row)))
+            for (link,) in self.conn.execute("SELECT link FROM seen_links"):
+                self._is_new({'link': link})
+
+    def _keys(self, row):
+        link = canonical_link(row['link'])
+        if _is_bare(row):
+            return 'seen:' + link, 'link:' + link
+        return 'link:' + link, 'id:' + generate_id({'title': row['title'], 'company': row['company'],
+                                                    'location': row['location'] or ''})
+
+    def _is_new(self, row):
+        if _is_bare(row):
+            # A bare history link says nothing about the content: it is new unless its link
+            # is known, and only other bare links register under its key
+            seen_key, link_key = self._keys(row)
+            if self.conn.execute("SELECT 1 FROM import_keys WHERE key = ?", (link_key,)).fetchone():
+                return False
+            return self.conn.execute("INSERT OR IGNORE INTO import_keys VALUES (?)", (seen_key,)).rowcount
+        link_key, id_key = self._keys(row)
+        new_link = self.conn.execute("INSERT OR IGNORE INTO import_keys VALUES (?)", (link_key,)).rowcount
+        new_id = self.conn.execute("INSERT OR IGNORE INTO import_keys VALUES (?)", (id_key,)).rowcount
+        return new_link and new_id
+
+    def _write(self, batch: List[Dict]) -> int:
+        with self.conn:
+            fresh = [row for row in batch if row['link'] and self._is_new(row)]
+            links = [(row['link'], row['source']) for row in fresh if _is_bare(row)]
+            self.links_written += self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_links (link, source) VALUES (?, ?)", links).rowcount
+            rows = [tuple(row[c] for c in SOURCE_COLUMNS) + (row.get('tags'), country_code(row['country']))
+                    for row in fresh if not _is_bare(row)]
+            # A full row replaces the bare link it was known by
+            self.conn.executemany("DELETE FROM seen_links WHERE link = ?",
+                                  [(row['link'],) for row in fresh if not _is_bare(row)])
+            # Cached searches of a running bot over these scopes are stale from this commit on
+            self.conn.executemany(GENERATION_BUMP, generation_scopes(
+                {(country_code(row['country']), row['field']) for row in fresh if not _is_bare(row)}))
+            # rowcount leaves out the rows the full-text triggers write
+            return self.conn.executemany(self._insert, rows).rowcount
+
+    def import_source(self, path: str):
+        read_before, written_before, links_before = self.read, self.written, self.links_written
+        for batch in chunked(read_source(path), self.batch_size):
+            self.written += self._write(batch)
+            previous, self.read = self.read, self.read + len(batch)
+            if self.read // LOG_EVERY > previous // LOG_EVERY:
+                self.log_progress()
+        logger.info(f"{path}: {self.read - read_before} rows read, {self.written - written_before} new"
+                    f"{f', {self.links_written - links_before} bare links' if self.links_written > links_before else ''}.")
+
+    def log_progress(self):
+        elapsed = time.perf_counter() - self._started
+        logger.info(f"Imported {self.read} rows ({self.written} new) in {elapsed:.1f}s, "
+                    f"{self.read / max(elapsed, 1e-9):,.0f} rows/s")
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Merge every internship store into one SQLite database")
+    parser.add_argument('target', help="Database to import into (created if missing)")
+    parser.add_argument('sources', nargs='*',
+                        help="Stores to import: .db, .snapshot.json, .jsonl, history.json or a JSON list of items "
+                             "(default: every store found under internship_bot/)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = args.sources or [os.path.join(base, p) for p in DEFAULT_SOURCES]
+    target = os.path.abspath(args.target)
+
+    importer = BulkImporter(target, args.batch_size)
+    try:
+        for path in sources:
+            if not os.path.exists(path):
+                logger.info(f"{path}: not found, skipping.")
+                continue
+            if os.path.abspath(path) == target:
+                logger.info(f"{path}: is the target, skipping.")
+                continue
+            importer.import_source(path)
+    finally:
+        importer.log_progress()
+        importer.close()
+
+
+if __name__ == "__main__":
+    main()
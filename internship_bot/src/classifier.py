@@ -0,0 +1,95 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
+
+# The single field taxonomy. Keywords match whole words or phrases; a trailing '*'
+# matches any word starting with the stem ("bio*" -> biology, biotech).
+TAXONOMY = {
+    "Computer Science": ["software", "develop*", "web", "frontend", "backend", "full stack",
+                         "java", "python", "c++", "react", "node", "android", "ios", "app", "apps", "cloud",
+                         "devops", "security", "cyber*"],
+    "Data Science & AI": ["data", "analyst", "analytics", "scientist", "machine learning", "ai", "deep learning",
+                          "nlp", "vision", "statistic*", "learning"],
+    # "engineer" alone is generic: "Software Engineer" ties and goes to Computer Science (listed first)
+    "Engineering": ["engineer*", "mechanical", "electrical", "civil", "chemical", "electronic*", "robotic*",
+                    "embedded", "hardware"],
+    "Bio & Science": ["bio*", "chem*", "physic*", "pharma*", "research*", "lab", "science"],
+    "Mathematics": ["math*", "cryptograph*", "actuar*"],
+}
+# A keyword in the title counts this much more than one in the tags
+TITLE_WEIGHT = 2
+CACHE_SIZE = 8192
+
+
+def _keyword_pattern(keyword):
+    if keyword.endswith('*'):
+        return re.escape(keyword[:-1]) + r'\w*'
+    return re.escape(keyword) + r'(?!\w)'
+
+
+class FieldClassifier:
+    """
+    Scores every field of the taxonomy in one pass over a title (and its tags).
+    All keywords are compiled into a single alternation with one named group per field,
+    so each match says which field it belongs to; the field with the highest score wins,
+    and ties go to the field listed first. Results are cached per normalized title.
+    """
+
+    def __init__(self, taxonomy=TAXONOMY, cache_size: int = CACHE_SIZE):
+        self.fields = list(taxonomy)
+        groups = []
+        for i, keywords in enumerate(taxonomy.values()):
+            # Longest first, so "machine learning" is preferred over "learning" at the same position
+            alternation = '|'.join(_keyword_pattern(k) for k in sorted(keywords, key=len, reverse=True))
+            groups.append(f'(?P<f{i}>{alternation})')
+        self.pattern = re.compile(r'(?<!\w)(?:' + '|'.join(groups) + ')')
+        self._classify_cached = lru_cache(maxsize=cache_size)(self._classify_normalized)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return ' '.join(text.lower().split())
+
+    def _scores(self, text, weight, scores):
+        for match in self.pattern.finditer(text):
+            index = int(match.lastgroup[1:])
+            scores[index] += weight
+
+    def _classify_normalized(self, title, tags):
+        scores = [0] * len(self.fields)
+        self._scores(title, TITLE_WEIGHT, scores)
+        for tag in tags:
+            self._scores(tag, 1, scores)
+        best = max(range(len(scores)), key=lambda i: (scores[i], -i))
+        return self.fields[best] if scores[best] else None
+
+    def classify(self, title: str, tags: Sequence[str] = ()) -> Optional[str]:
+        """Best-scoring field for `title` and `tags`, or None if no keyword matches."""
+        return self._classify_cached(self.normalize(title or ''),
+                                     tuple(self.normalize(t) for t in tags or () if t))
+
+    def classify_many(self, titles: Iterable[str], tags: Iterable[Sequence[str]] = None) -> List[Optional[str]]:
+        """Classifies a batch, scoring each distinct (title, tags) only once."""
+        titles = list(titles)
+        tags = list(tags) if tags is not None else [()] * len(titles)
+        seen = {}
+        results = []
+        for title, item_tags in zip(titles, tags):
+            key = (title, tuple(item_tags or ()))
+            if key not in seen:
+                seen[key] = self.classify(title, item_tags)
+            results.append(seen[key])
+        return results
+
+    def cache_info(self):
+        return self._classify_cached.cache_info()
+
+
+_default = FieldClassifier()
+
+
+def classify(title: str, tags: Sequence[str] = ()) -> Optional[str]:
+    return _default.classify(title, tags)
+
+
+def classify_many(titles: Iterable[str], tags: Iterable[Sequence[str]] = None) -> List[Optional[str]]:
+    return _default.classify_many(titles, tags)
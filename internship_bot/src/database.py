@@ -1,9 +1,103 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import create_engine, event, func, inspect, text, Column, Integer, String, DateTime, Text, Boolean, Index
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
+import logging
 import os
+import re
+
+try:
+    from gazetteer import COUNTRY_CODES
+    from search_cache import SearchCache
+except ImportError:
+    from src.gazetteer import COUNTRY_CODES
+    from src.search_cache import SearchCache
 
 Base = declarative_base()
+logger = logging.getLogger(__name__)
+
+# Links per SELECT ... IN (...) when checking which rows already exist
+IN_BATCH = 500
+# Applied to every new connection: WAL lets the bot read while the scraper writes,
+# and with WAL, synchronous=NORMAL is still safe against corruption (a crash may lose
+# only the last commits). mmap and a 64 MB page cache keep hot indexes in memory.
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+}
+
+# Full-text index over internships, kept in sync by triggers (external content: the
+# text lives only in `internships`). A title hit counts most, then company, location, tags.
+FTS_TABLE = 'internships_fts'
+FTS_SCHEMA = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, company, location, tags, "
+    f"content='internships', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 5.0, 3.0, 2.0)')",
+    f"""CREATE TRIGGER internships_fts_insert AFTER INSERT ON internships BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, company, location, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.tags);
+    END""",
+    f"""CREATE TRIGGER internships_fts_delete AFTER DELETE ON internships BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, location, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.tags);
+    END""",
+    f"""CREATE TRIGGER internships_fts_update AFTER UPDATE OF title, company, location, tags ON internships BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, location, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, company, location, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.tags);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+# Only the newest matches (by insertion) are ranked: bm25 is then computed for at most
+# this many rows however common the words are, and FTS5 stops reading the index early
+FTS_CANDIDATES = 1000
+# A match this many days old ranks half as high as the same match posted today
+RECENCY_DAYS = 30
+# Full-text ranking: bm25 (negative, lower is better) scaled down with the posting's age
+# (undated rows count as a year old)
+FTS_QUERY = f"""
+    SELECT internships.* FROM (
+        SELECT rowid, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match ORDER BY rowid DESC LIMIT :candidates
+    ) AS hits JOIN internships ON internships.id = hits.rowid
+    ORDER BY hits.rank / (1.0 + COALESCE(MAX(julianday('now') - julianday(COALESCE(internships.date_posted,
+                                                                                     internships.created_at)), 0),
+                                         365) / :recency_days)
+    LIMIT :limit
+"""
+_WORD = re.compile(r'\w+')
+
+def fts_match(query):
+    """
+    FTS5 query for free text: every word must match. Words are quoted so user input is
+    never FTS syntax; the porter tokenizer matches other forms ("engineer" -> engineering)
+    without the cost of prefix queries.
+    """
+    return ' '.join(f'"{word}"' for word in _WORD.findall(query or ''))
+
+# Bumps the generation of a search scope (see SearchCache); run in the transaction that
+# adds the rows, so readers in any process see the rows and the new generation together
+GENERATION_BUMP = ("INSERT INTO search_generations (scope, generation) VALUES (:scope, 1) "
+                   "ON CONFLICT(scope) DO UPDATE SET generation = generation + 1")
+
+def scope_key(code, field):
+    """search_generations key of a (country_code, field) scope, None meaning "All"."""
+    return f"{code or '*'}|{field or '*'}"
+
+def generation_scopes(rows):
+    """Every scope a search could see one of `rows` (country_code, field pairs) in."""
+    keys = set()
+    for code, field in rows:
+        keys.update(scope_key(c, f) for c in (code, None) for f in (field, None))
+    return [{'scope': key} for key in sorted(keys)]
+
+def country_code(country):
+    """Normalized key for a country name: its ISO code, or REMOTE / OTHER / UNKNOWN."""
+    if not country:
+        return 'UNKNOWN'
+    return COUNTRY_CODES.get(country) or country.upper()
 
 class Internship(Base):
     __tablename__ = 'internships'
@@ -16,9 +110,18 @@ class Internship(Base):
     date_posted = Column(DateTime)
     source = Column(String)
     country = Column(String)
+    country_code = Column(String)
     field = Column(String)
+    tags = Column(Text)
     created_at = Column(DateTime, default=datetime.now)
 
+# One index per shape of search_internships query, each ending in date_posted DESC so
+# the newest rows are read straight off the index with no sort
+Index('ix_internships_country_field_date', Internship.country_code, Internship.field, Internship.date_posted.desc())
+Index('ix_internships_country_date', Internship.country_code, Internship.date_posted.desc())
+Index('ix_internships_field_date', Internship.field, Internship.date_posted.desc())
+Index('ix_internships_date', Internship.date_posted.desc())
+
 class UserRequest(Base):
     __tablename__ = 'user_requests'
     
@@ -27,12 +130,66 @@ class UserRequest(Base):
     date = Column(String, nullable=False) # YYYY-MM-DD
     count = Column(Integer, default=0)
 
+# One row per user and day, so the rate limiter's batched writes can upsert
+Index('ux_user_requests_user_date', UserRequest.user_id, UserRequest.date, unique=True)
+
+class SeenLink(Base):
+    """A link known with nothing else about it (history.json): remembered, but not an internship to search."""
+    __tablename__ = 'seen_links'
+
+    link = Column(String, primary_key=True)
+    source = Column(String)
+
+class SearchGeneration(Base):
+    """How many times rows were added to a search scope; cached results of an older generation are stale."""
+    __tablename__ = 'search_generations'
+
+    scope = Column(String, primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+
 class Database:
-    def __init__(self, db_path='internships.db'):
+    def __init__(self, db_path='internships.db', search_cache: SearchCache = None):
         self.engine = create_engine(f'sqlite:///{db_path}')
+        # Results of search_internships / full_text_search; inserts from any process invalidate them
+        self.search_cache = search_cache if search_cache is not None else SearchCache()
+        event.listen(self.engine, 'connect', self._on_connect)
         Base.metadata.create_all(self.engine)
+        self._migrate()
         self.Session = sessionmaker(bind=self.engine)
 
+    @staticmethod
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+        dbapi_connection.create_function('country_code', 1, country_code, deterministic=True)
+
+    def _migrate(self):
+        """Brings databases created before country_code, tags and the search indexes up to date."""
+        columns = {c['name'] for c in inspect(self.engine).get_columns('internships')}
+        with self.engine.begin() as conn:
+            if 'tags' not in columns:
+                conn.execute(text("ALTER TABLE internships ADD COLUMN tags TEXT"))
+            if 'country_code' not in columns:
+                conn.execute(text("ALTER TABLE internships ADD COLUMN country_code VARCHAR"))
+                conn.execute(text("UPDATE internships SET country_code = country_code(country)"))
+            for index in Internship.__table__.indexes:
+                index.create(conn, checkfirst=True)
+            if not inspect(conn).has_table(FTS_TABLE):
+                # Creates the index, its triggers, and indexes the rows already stored
+                for statement in FTS_SCHEMA:
+                    conn.exec_driver_sql(statement)
+            if 'ux_user_requests_user_date' not in {i['name'] for i in inspect(conn).get_indexes('user_requests')}:
+                # Keep the highest count of any (user, day) stored twice before the index existed
+                conn.execute(text("""
+                    DELETE FROM user_requests WHERE id NOT IN (
+                        SELECT id FROM (SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY user_id, date ORDER BY count DESC) AS n FROM user_requests)
+                        WHERE n = 1)"""))
+                for index in UserRequest.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+
     def get_session(self):
         return self.Session()
 
@@ -50,9 +207,13 @@ class Database:
                     date_posted=data.get('date_obj'), # Expecting datetime object
                     source=data.get('source'),
                     country=data.get('country'),
-                    field=data.get('field')
+                    country_code=country_code(data.get('country')),
+                    field=data.get('field'),
+                    tags=', '.join(data.get('tags') or ()) or None
                 )
                 session.add(internship)
+                session.execute(text(GENERATION_BUMP),
+                                generation_scopes([(country_code(data.get('country')), data.get('field'))]))
                 session.commit()
                 return True
         except Exception as e:
@@ -62,21 +223,161 @@ class Database:
             session.close()
         return False
 
-    def search_internships(self, country=None, field=None, limit=5):
+    def add_internships_bulk(self, records):
+        """
+        Inserts many rows in one transaction, as a single INSERT ... ON CONFLICT(link) DO NOTHING
+        run with executemany. Returns the links that were newly inserted, in input order.
+        On any error (e.g. the database is locked) nothing is inserted and the error is raised,
+        so the caller never takes an unsaved batch for a stored one.
+        """
+        rows = []
+        seen = set()
+        for data in records:
+            link = data.get('link')
+            if not link or link in seen:
+                continue
+            seen.add(link)
+            rows.append({
+                'title': data.get('title'),
+                'company': data.get('company'),
+                'location': data.get('location'),
+                'link': link,
+                'date_posted': data.get('date_obj'), # Expecting datetime object
+                'source': data.get('source'),
+                'country': data.get('country'),
+                'country_code': country_code(data.get('country')),
+                'field': data.get('field'),
+                'tags': ', '.join(data.get('tags') or ()) or None,
+            })
+        if not rows:
+            return []
+
         session = self.Session()
         try:
-            query = session.query(Internship)
-            if country and country != 'All':
-                query = query.filter(Internship.country.ilike(f'%{country}%'))
-            if field and field != 'All':
-                 # Simple substring match for now, or exact match depending on classifier
-                query = query.filter(Internship.field == field)
-            
-            # Order by newest first
-            results = query.order_by(Internship.date_posted.desc()).limit(limit).all()
+            links = [row['link'] for row in rows]
+            # Read in the same transaction as the insert, so "new" means new to this commit
+            existing = set()
+            for start in range(0, len(links), IN_BATCH):
+                existing.update(link for (link,) in session.query(Internship.link)
+                                .filter(Internship.link.in_(links[start:start + IN_BATCH])))
+            statement = sqlite_insert(Internship).on_conflict_do_nothing(index_elements=['link'])
+            session.connection().execute(statement, rows)
+            new_links = [link for link in links if link not in existing]
+            added = set(new_links)
+            if added:
+                session.execute(text(GENERATION_BUMP), generation_scopes(
+                    {(row['country_code'], row['field']) for row in rows if row['link'] in added}))
+            session.commit()
+            return new_links
+        except Exception as e:
+            logger.error(f"Failed to add {len(rows)} internships, batch rolled back: {e}")
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @staticmethod
+    def _search_scope(country=None, field=None):
+        return (country_code(country) if country and country != 'All' else None,
+                field if field and field != 'All' else None)
+
+    def _generation(self, scope):
+        """The stored generation of a search scope, as committed by any process."""
+        with self.engine.connect() as conn:
+            generation = conn.execute(text("SELECT generation FROM search_generations WHERE scope = :scope"),
+                                      {'scope': scope_key(*scope)}).scalar()
+        return generation or 0
+
+    def _search_query(self, session, country=None, field=None):
+        code, field = self._search_scope(country, field)
+        query = session.query(Internship)
+        if code is not None:
+            query = query.filter(Internship.country_code == code)
+        if field is not None:
+            query = query.filter(Internship.field == field)
+        # Order by newest first
+        return query.order_by(Internship.date_posted.desc())
+
+    def search_internships(self, country=None, field=None, limit=5, offset=0):
+        """Newest internships for a country and field ('All' or None for any), `limit` per page from `offset`."""
+        scope = self._search_scope(country, field)
+        key = ('search', scope, limit, offset)
+        # Read before querying: an insert while the query runs leaves this result already stale
+        generation = self._generation(scope)
+        results = self.search_cache.get(key, generation)
+        if results is not None:
+            return results
+        session = self.Session()
+        try:
+            results = self._search_query(session, country, field).offset(offset).limit(limit).all()
+        finally:
+            session.close()
+        self.search_cache.put(key, generation, results)
+        return results
+
+    def full_text_search(self, query, limit=5):
+        """
+        Keyword search ("rust embedded berlin") over title, company, location and tags,
+        through the FTS5 index. The newest FTS_CANDIDATES matches are ranked by bm25,
+        scaled down with age so that newer postings come first among similar matches.
+        """
+        match = fts_match(query)
+        if not match:
+            return []
+        # Any new row could match the keywords
+        scope = (None, None)
+        key = ('text', match, limit)
+        generation = self._generation(scope)
+        results = self.search_cache.get(key, generation)
+        if results is not None:
             return results
+        session = self.Session()
+        try:
+            statement = text(FTS_QUERY).bindparams(match=match, candidates=FTS_CANDIDATES,
+                                                   recency_days=RECENCY_DAYS, limit=limit)
+            results = session.query(Internship).from_statement(statement).all()
         finally:
             session.close()
+        self.search_cache.put(key, generation, results)
+        return results
+
+    def cache_stats(self):
+        """Hits, misses, hit rate and size of the search result cache."""
+        return self.search_cache.stats()
+
+    def explain_search(self, country=None, field=None, limit=5):
+        """SQLite's EXPLAIN QUERY PLAN for search_internships, one line per step."""
+        session = self.Session()
+        try:
+            statement = self._search_query(session, country, field).limit(limit).statement
+            compiled = statement.compile(dialect=self.engine.dialect)
+            rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}",
+                                                        tuple(compiled.params[name] for name in compiled.positiontup))
+            return [row[-1] for row in rows]
+        finally:
+            session.close()
+
+    def load_request_counts(self, since):
+        """{(user_id, date): count} for the user_requests rows dated `since` (YYYY-MM-DD) or later."""
+        session = self.Session()
+        try:
+            rows = session.query(UserRequest.user_id, UserRequest.date, UserRequest.count) \
+                .filter(UserRequest.date >= since).all()
+            return {(user_id, date): count or 0 for user_id, date, count in rows}
+        finally:
+            session.close()
+
+    def save_request_counts(self, counts):
+        """Upserts {(user_id, date): count} in one transaction. A stored count is never lowered."""
+        if not counts:
+            return
+        statement = sqlite_insert(UserRequest)
+        statement = statement.on_conflict_do_update(
+            index_elements=['user_id', 'date'],
+            set_={'count': func.max(UserRequest.count, statement.excluded.count)})
+        with self.engine.begin() as conn:
+            conn.execute(statement, [{'user_id': user_id, 'date': date, 'count': count}
+                                     for (user_id, date), count in counts.items()])
 
     def check_rate_limit(self, user_id, limit=100):
         session = self.Session()
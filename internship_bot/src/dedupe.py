@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from, never which posting it is
+TRACKING_PARAMS = {'ref', 'refid', 'trk', 'trackingid', 'gclid', 'fbclid'}
+
+
+def canonical_link(url: Optional[str]) -> Optional[str]:
+    """
+    Reduces an apply link to a stable key, so the same posting reached through
+    different URLs dedupes: lowercases scheme and host, drops the fragment,
+    trailing slash, default ports and tracking parameters, and sorts the query.
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not (k.lower().startswith('utm_') or k.lower() in TRACKING_PARAMS))
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip('/'), urlencode(query), ''))
+
+
+class DedupeIndex:
+    """
+    Hash-map index over stored internships: O(1) lookups by id hash and by
+    canonical apply link, so checking a new item costs the same however many
+    items are already stored. Built once per run and updated as items are added.
+    Each item's canonical link is cached on it as `link_key`, so it is persisted with
+    the data and later runs build the index without re-parsing every URL.
+    """
+
+    def __init__(self, items: Iterable[Dict] = ()):
+        self.ids = set()
+        # canonical apply link -> id of the item that owns it
+        self.links = {}
+        for item in items:
+            self.add(item)
+            # Near-duplicates linked to this item keep their own ids and links out too
+            for duplicate in item.get('duplicates', ()):
+                self.add(duplicate)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _link_key(item):
+        key = item.get('link_key')
+        if key is None:
+            key = item['link_key'] = canonical_link(item.get('apply_link'))
+        return key
+
+    def contains(self, item: Dict) -> bool:
+        return item['id'] in self.ids or self._link_key(item) in self.links
+
+    def add(self, item: Dict):
+        self.ids.add(item['id'])
+        self.links.setdefault(self._link_key(item), item['id'])
@@ -0,0 +1,213 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "data/internships.snapshot.json"
+LOG_FILE = "data/internships.events.jsonl"
+# The whole-file JSON format used before the event log
+LEGACY_FILE = "data/internships.json"
+# Events appended since the last snapshot before the log is folded into a new one
+COMPACT_EVERY = 1000
+SNAPSHOT_VERSION = 1
+
+INSERT, POSTED, DUPLICATE = 'insert', 'posted', 'duplicate'
+
+
+def _fsync_dir(path):
+    # Makes a rename durable; not supported on every platform
+    try:
+        fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class EventStore:
+    """
+    Internship storage as a snapshot plus an append-only JSON-lines log of events
+    ('insert' an item, mark an id 'posted', link a 'duplicate' to the item it repeats),
+    replayed into an in-memory view on open.
+    A write appends one line instead of rewriting the whole dataset; `sync()` fsyncs
+    the log, and every COMPACT_EVERY events the view is written to a new snapshot
+    (temp file + fsync + atomic rename) and the log is emptied.
+    Replaying an event twice has no effect, so a crash at any point loses at most
+    the events written since the last sync.
+    """
+
+    def __init__(self, snapshot_file: str = None, log_file: str = None, legacy_file: str = None,
+                 compact_every: int = COMPACT_EVERY):
+        self.snapshot_file = snapshot_file or os.path.join(os.getcwd(), SNAPSHOT_FILE)
+        self.log_file = log_file or os.path.join(os.getcwd(), LOG_FILE)
+        self.legacy_file = legacy_file or os.path.join(os.getcwd(), LEGACY_FILE)
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self.items: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._pending = 0
+        # Events appended since the last sync
+        self.unsynced = 0
+
+        os.makedirs(os.path.dirname(self.snapshot_file), exist_ok=True)
+        if not os.path.exists(self.snapshot_file):
+            self._migrate()
+        self._load()
+        self._log = open(self.log_file, 'a', encoding='utf-8')
+
+    def _migrate(self):
+        """One-time conversion of the legacy internships.json into the first snapshot."""
+        items = []
+        if os.path.exists(self.legacy_file):
+            try:
+                with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                    items = json.load(f)
+            except json.JSONDecodeError:
+                logger.error(f"Could not read {self.legacy_file}; starting with an empty store.")
+            logger.info(f"Migrating {len(items)} internships from {self.legacy_file} to {self.snapshot_file}")
+        self._write_snapshot(items)
+        if os.path.exists(self.legacy_file):
+            os.replace(self.legacy_file, self.legacy_file + ".migrated")
+
+    def _load(self):
+        with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        for item in snapshot['items']:
+            self._apply_insert(item)
+
+        if not os.path.exists(self.log_file):
+            return
+        good_end = 0
+        with open(self.log_file, 'rb') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.endswith(b'\n'):
+                    # A torn final line from a crash mid-write; everything before it is intact
+                    logger.warning(f"Dropping incomplete event at {self.log_file}:{line_no}")
+                    break
+                good_end += len(line)
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring unreadable event at {self.log_file}:{line_no}")
+                    continue
+                self._apply(event)
+                self._pending += 1
+        if good_end != os.path.getsize(self.log_file):
+            # Cut the torn tail so new events don't get glued onto it
+            with open(self.log_file, 'r+b') as f:
+                f.truncate(good_end)
+
+    def _apply(self, event):
+        if event['op'] == INSERT:
+            self._apply_insert(event['item'])
+        elif event['op'] == POSTED:
+            item = self._by_id.get(event['id'])
+            if item is not None:
+                item['posted_to_telegram'] = True
+        elif event['op'] == DUPLICATE:
+            self._apply_duplicate(event['id'], event['item'])
+
+    def _apply_duplicate(self, canonical_id, duplicate):
+        item = self._by_id.get(canonical_id)
+        if item is None:
+            return False
+        duplicates = item.setdefault('duplicates', [])
+        if any(d['id'] == duplicate['id'] for d in duplicates):
+            return False
+        duplicates.append(duplicate)
+        return True
+
+    def _apply_insert(self, item):
+        if item['id'] in self._by_id:
+            return False
+        self.items.append(item)
+        self._by_id[item['id']] = item
+        return True
+
+    def _append(self, event):
+        self._log.write(json.dumps(event) + '\n')
+        self._pending += 1
+        self.unsynced += 1
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        return self._by_id.get(item_id)
+
+    def insert(self, item: Dict, sync: bool = True) -> bool:
+        """Adds `item` unless its id is already stored. Returns True if it was added."""
+        with self._lock:
+            if not self._apply_insert(item):
+                return False
+            self._append({'op': INSERT, 'item': item})
+            if sync:
+                self.sync()
+            return True
+
+    def mark_posted(self, item_id: str, sync: bool = True) -> bool:
+        with self._lock:
+            item = self._by_id.get(item_id)
+            if item is None or item.get('posted_to_telegram'):
+                return False
+            item['posted_to_telegram'] = True
+            self._append({'op': POSTED, 'id': item_id})
+            if sync:
+                self.sync()
+            return True
+
+    def link_duplicate(self, canonical_id: str, duplicate: Dict, sync: bool = True) -> bool:
+        """Records `duplicate` (a small dict with at least an id) under the item it repeats."""
+        with self._lock:
+            if not self._apply_duplicate(canonical_id, duplicate):
+                return False
+            self._append({'op': DUPLICATE, 'id': canonical_id, 'item': duplicate})
+            if sync:
+                self.sync()
+            return True
+
+    def sync(self, compact: bool = True):
+        """
+        Makes every appended event durable with one write: an fsync of the log, or,
+        once the log has grown long enough, a compaction into a new snapshot.
+        Bulk writers pass compact=False and call compact() once when they finish.
+        """
+        with self._lock:
+            if compact and self._pending >= self.compact_every:
+                self.compact()
+                return
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self.unsynced = 0
+
+    def compact(self):
+        """Writes the current view to a new snapshot and empties the log."""
+        with self._lock:
+            self._write_snapshot(self.items)
+            # If we crash before the truncate, replaying the old log over the new snapshot is a no-op
+            self._log.close()
+            self._log = open(self.log_file, 'w', encoding='utf-8')
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            logger.info(f"Compacted {self._pending} events into {self.snapshot_file}")
+            self._pending = 0
+            self.unsynced = 0
+
+    def _write_snapshot(self, items):
+        tmp = self.snapshot_file + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': SNAPSHOT_VERSION, 'items': items}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_file)
+        _fsync_dir(self.snapshot_file)
+
+    def close(self):
+        with self._lock:
+            if not self._log.closed:
+                self.sync()
+                self._log.close()
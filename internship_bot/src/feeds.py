@@ -0,0 +1,74 @@
+import logging
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+ENTRY_TAGS = ('item', 'entry')  # RSS 2.0, Atom
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(elem):
+    return (elem.text or '').strip() if elem is not None else ''
+
+
+def _entry_fields(elem) -> Dict:
+    """Reads one <item>/<entry> element into a flat dict, for RSS 2.0 and Atom alike."""
+    fields = {'title': '', 'link': '', 'published': '', 'author': '', 'tags': []}
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'title':
+            fields['title'] = _text(child)
+        elif name == 'link':
+            # RSS: <link>url</link>; Atom: <link href="url" rel="alternate"/>
+            href = child.get('href')
+            if href is None:
+                fields['link'] = fields['link'] or _text(child)
+            elif child.get('rel', 'alternate') == 'alternate' or not fields['link']:
+                fields['link'] = href
+        elif name in ('pubDate', 'published', 'date') or (name == 'updated' and not fields['published']):
+            fields['published'] = _text(child)
+        elif name in ('author', 'creator'):
+            # Atom nests the name: <author><name>..</name></author>
+            name_elem = next((c for c in child if _local(c.tag) == 'name'), None)
+            fields['author'] = _text(name_elem) if name_elem is not None else _text(child)
+        elif name == 'category':
+            term = child.get('term') or _text(child)
+            if term:
+                fields['tags'].append(term)
+    return fields
+
+
+def iter_entries(stream, keywords: List[str] = None) -> Iterator[Dict]:
+    """
+    Incrementally parses an RSS 2.0 or Atom document from a binary stream and yields
+    one dict (title, link, published, author, tags) per entry as soon as it is complete.
+    Each entry is detached from the tree once handled, so memory stays flat however
+    large the feed is. Entries whose title contains none of `keywords` are skipped
+    before any dict is built.
+    """
+    keywords = [k.lower() for k in keywords] if keywords else None
+    stack = []
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if _local(elem.tag) not in ENTRY_TAGS:
+            continue
+
+        if keywords is not None:
+            title = next((_text(c) for c in elem if _local(c.tag) == 'title'), '').lower()
+            matched = any(k in title for k in keywords)
+        else:
+            matched = True
+        if matched:
+            yield _entry_fields(elem)
+
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
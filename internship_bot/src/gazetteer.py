@@ -0,0 +1,129 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+# (alias, ISO 3166 code) for country names, cities and unambiguous abbreviations, matched
+# case-insensitively as whole words. When a location mentions several, the one listed first wins.
+ALIASES = [
+    ('united states', 'US'), ('usa', 'US'),
+    ('new york', 'US'), ('san francisco', 'US'), ('seattle', 'US'), ('boston', 'US'), ('austin', 'US'),
+    ('chicago', 'US'), ('los angeles', 'US'), ('palo alto', 'US'), ('mountain view', 'US'),
+    ('united kingdom', 'GB'), ('uk', 'GB'), ('great britain', 'GB'), ('london', 'GB'),
+    ('canada', 'CA'), ('toronto', 'CA'), ('vancouver', 'CA'), ('montreal', 'CA'),
+    ('australia', 'AU'), ('sydney', 'AU'), ('melbourne', 'AU'),
+    ('germany', 'DE'), ('berlin', 'DE'), ('munich', 'DE'),
+    ('france', 'FR'), ('paris', 'FR'),
+    ('switzerland', 'CH'), ('geneva', 'CH'), ('zurich', 'CH'),
+    ('netherlands', 'NL'), ('amsterdam', 'NL'),
+    ('spain', 'ES'), ('madrid', 'ES'), ('barcelona', 'ES'),
+    ('italy', 'IT'),
+    ('sweden', 'SE'),
+    ('ireland', 'IE'), ('dublin', 'IE'),
+    ('austria', 'AT'),
+    ('belgium', 'BE'),
+    ('portugal', 'PT'),
+    ('poland', 'PL'),
+    ('denmark', 'DK'),
+    ('norway', 'NO'),
+    ('finland', 'FI'),
+    ('india', 'IN'), ('bangalore', 'IN'), ('bengaluru', 'IN'), ('mumbai', 'IN'), ('delhi', 'IN'),
+    ('new zealand', 'NZ'),
+    ('singapore', 'SG'),
+]
+
+# Two-letter codes, in priority order. Many are also English words ("in", "us", "it", "de"
+# in "Île-de-France"), so a code only counts when written in capitals ("Remote in US") or
+# as a whole comma-separated part ("Geneva, ch"), and any alias above outranks it:
+# "San Francisco, CA" is in the US, "Remote (US or Canada)" in Canada.
+CODES = ['US', 'GB', 'CA', 'AU', 'DE', 'FR', 'CH', 'NL', 'ES', 'IT', 'SE', 'IE', 'AT', 'BE', 'PT', 'PL',
+         'DK', 'NO', 'FI', 'IN', 'NZ', 'SG']
+
+# US state abbreviations. After a city ("Sunnyvale, CA", "Wilmington, DE", "Indianapolis, IN")
+# one is a state, not the country code it may also be, unless the location is remote
+# ("Remote, CA" is Canada) or names a country, which outranks it ("Hamburg, DE, Germany").
+US_STATES = {
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY',
+    'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND',
+    'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY', 'DC',
+}
+
+COUNTRY_NAMES = {
+    'US': 'United States', 'GB': 'United Kingdom', 'CA': 'Canada', 'AU': 'Australia',
+    'NZ': 'New Zealand', 'DE': 'Germany', 'FR': 'France', 'CH': 'Switzerland',
+    'NL': 'Netherlands', 'ES': 'Spain', 'IT': 'Italy', 'SE': 'Sweden', 'IE': 'Ireland',
+    'AT': 'Austria', 'BE': 'Belgium', 'PT': 'Portugal', 'PL': 'Poland', 'DK': 'Denmark',
+    'NO': 'Norway', 'FI': 'Finland', 'IN': 'India', 'SG': 'Singapore',
+}
+COUNTRY_CODES = {name: code for code, name in COUNTRY_NAMES.items()}
+# The Processor's data file has always used these short forms
+SHORT_NAMES = {**COUNTRY_NAMES, 'US': 'USA', 'GB': 'UK'}
+
+CACHE_SIZE = 4096
+
+
+class Gazetteer:
+    """
+    Resolves free-text locations ("Geneva, ch", "Remote in US") to ISO country codes.
+    All aliases are compiled once into a single word-bounded alternation, and all codes
+    into another, so a location is scanned in one pass instead of once per alias; results
+    are kept in an LRU cache keyed on the whitespace-normalized string, since the same
+    locations repeat constantly.
+    """
+
+    def __init__(self, aliases=ALIASES, codes=CODES, cache_size: int = CACHE_SIZE):
+        self.priority = {}
+        for rank, (alias, code) in enumerate(aliases):
+            self.priority.setdefault(alias, (rank, code))
+        # Ranked after every alias
+        self.codes = {code: (len(aliases) + rank, code) for rank, code in enumerate(codes)}
+        # Longest first, so "united states" is preferred over a shorter alias at the same position
+        alternation = '|'.join(re.escape(a) for a in sorted(self.priority, key=len, reverse=True))
+        self.pattern = re.compile(r'\b(?:' + alternation + r')\b')
+        self.code_pattern = re.compile(r'\b(?:' + '|'.join(self.codes) + r')\b')
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve_normalized)
+
+    @staticmethod
+    def normalize(location: str) -> str:
+        # Case is kept: it tells the code "US" from the word "us"
+        return ' '.join(location.split())
+
+    def _resolve_normalized(self, text):
+        lowered = text.lower()
+        candidates = [self.priority[m.group()] for m in self.pattern.finditer(lowered)]
+        parts = [p.strip().upper() for p in text.split(',')]
+        states = set() if 'remote' in lowered else {part for part in parts[1:] if part in US_STATES}
+        if states:
+            candidates.append(self.codes['US'])
+        candidates += [self.codes[m.group()] for m in self.code_pattern.finditer(text) if m.group() not in states]
+        candidates += [self.codes[part] for part in parts if part in self.codes and part not in states]
+        return min(candidates)[1] if candidates else None
+
+    def resolve(self, location: str) -> Optional[str]:
+        """ISO code of the country `location` refers to, or None."""
+        if not location:
+            return None
+        return self._resolve_cached(self.normalize(location))
+
+    def resolve_many(self, locations: Iterable[str]) -> List[Optional[str]]:
+        """Resolves a batch, scanning each distinct location only once."""
+        resolved = {}
+        results = []
+        for location in locations:
+            if location not in resolved:
+                resolved[location] = self.resolve(location)
+            results.append(resolved[location])
+        return results
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+
+_default = Gazetteer()
+
+
+def resolve_country(location: str) -> Optional[str]:
+    return _default.resolve(location)
+
+
+def resolve_many(locations: Iterable[str]) -> List[Optional[str]]:
+    return _default.resolve_many(locations)
@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+HEALTH_FILE = "data/source_health.json"
+# Consecutive failures before a source's circuit opens
+FAILURE_THRESHOLD = 3
+# Wait before the first half-open probe; doubles after every failed probe up to the cap
+BASE_BACKOFF = 6 * 3600
+MAX_BACKOFF = 14 * 24 * 3600
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class SourceUnavailable(Exception):
+    """Raised by a scraper when its source could not be fetched (network error, block, bad status)."""
+
+
+class SourceHealth:
+    """
+    Persisted per-source health record with a circuit breaker.
+    A source's circuit opens after FAILURE_THRESHOLD consecutive failures and the
+    source is skipped until its backoff expires. It then gets a single half-open probe:
+    success closes the circuit, failure reopens it with double the backoff.
+    """
+
+    def __init__(self, health_file: str = None, failure_threshold: int = FAILURE_THRESHOLD,
+                 base_backoff: float = BASE_BACKOFF, max_backoff: float = MAX_BACKOFF):
+        self.health_file = health_file or os.path.join(os.getcwd(), HEALTH_FILE)
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self.records = self._load()
+
+    def _load(self):
+        try:
+            with open(self.health_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.health_file), exist_ok=True)
+            tmp = self.health_file + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self.records, f, indent=2)
+            os.replace(tmp, self.health_file)
+
+    def _record(self, name):
+        return self.records.setdefault(name, {'state': CLOSED, 'failures': 0, 'backoff': 0, 'next_probe': 0})
+
+    def allow(self, name: str) -> bool:
+        """Whether `name` should be fetched this run. Moves an expired open circuit to half-open."""
+        with self._lock:
+            record = self._record(name)
+            if record['state'] == OPEN:
+                if time.time() < record['next_probe']:
+                    return False
+                record['state'] = HALF_OPEN
+                logger.info(f"Source {name}: circuit half-open, probing.")
+            return True
+
+    def record_success(self, name: str):
+        with self._lock:
+            record = self._record(name)
+            if record['state'] != CLOSED:
+                logger.info(f"Source {name}: recovered, circuit closed.")
+            record.update(state=CLOSED, failures=0, backoff=0, next_probe=0)
+
+    def record_failure(self, name: str):
+        with self._lock:
+            record = self._record(name)
+            record['failures'] += 1
+            if record['state'] == HALF_OPEN:
+                record['backoff'] = min(record['backoff'] * 2 or self.base_backoff, self.max_backoff)
+            elif record['failures'] >= self.failure_threshold:
+                record['backoff'] = self.base_backoff
+            else:
+                return
+            record['state'] = OPEN
+            record['next_probe'] = time.time() + record['backoff']
+            logger.warning(f"Source {name}: circuit open after {record['failures']} failures, "
+                           f"next probe in {record['backoff'] / 3600:.1f}h.")
@@ -0,0 +1,132 @@
+import logging
+import os
+from typing import List, Dict
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup tree builder)
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+logger = logging.getLogger(__name__)
+
+
+def _classes(attrs):
+    value = attrs.get('class') or []
+    return value.split() if isinstance(value, str) else value
+
+
+# Card-extraction rules, one table per source.
+# `card` selects one listing; each field is a list of fallbacks tried in order.
+# "sel" takes the element's text, "sel@attr" an attribute, and "@attr" an attribute of the card itself.
+INTERNSHALA = {
+    'card': 'div.individual_internship, div[id^="individual_internship_"]',
+    'strainer': lambda name, attrs: name == 'div' and (
+        'individual_internship' in _classes(attrs)
+        or (attrs.get('id') or '').startswith('individual_internship_')),
+    'fields': {
+        'title': ['a.job-title-href', 'h3.heading_4_5', 'div.heading_4_5', 'a.heading_4_5', 'h3'],
+        'company': ['p.company-name', 'h4.heading_6_company', 'div.company_name', 'a.link_display_like_text'],
+        'location': ['div.locations span', 'a.location_link', 'span.location_link', 'div#location_names'],
+        'stipend': ['span.stipend'],
+        'link': ['@data-href', 'a.view_detail_button@href', 'a.job-title-href@href', 'a[href*="/internship/detail/"]@href'],
+    },
+}
+
+LINKEDIN = {
+    'card': 'li',
+    'strainer': 'li',
+    'fields': {
+        'title': ['a.base-card__full-link', 'a.job-search-card__job-title'],
+        'link': ['a.base-card__full-link@href', 'a.job-search-card__job-title@href'],
+        'company': ['h4.base-search-card__subtitle', 'a.hidden-nested-link'],
+        'location': ['span.job-search-card__location'],
+        'date': ['time@datetime'],
+    },
+}
+
+
+def _split(rule):
+    selector, _, attr = rule.partition('@')
+    return selector, attr
+
+
+def _extract_bs4(content, table, parser):
+    strainer = SoupStrainer(table['strainer']) if table.get('strainer') else None
+    soup = BeautifulSoup(content, parser, parse_only=strainer)
+
+    cards = []
+    for card in soup.select(table['card']):
+        record = {}
+        for field, rules in table['fields'].items():
+            record[field] = None
+            for rule in rules:
+                selector, attr = _split(rule)
+                elem = card.select_one(selector) if selector else card
+                if elem is None:
+                    continue
+                value = elem.get(attr) if attr else elem.get_text(strip=True)
+                if value:
+                    record[field] = value
+                    break
+        cards.append(record)
+    return cards
+
+
+def _extract_selectolax(content, table):
+    tree = HTMLParser(content)
+    cards = []
+    seen = set()
+    for card in tree.css(table['card']):
+        # Lexbor returns a node once per matching selector in a group
+        if card.mem_id in seen:
+            continue
+        seen.add(card.mem_id)
+        record = {}
+        for field, rules in table['fields'].items():
+            record[field] = None
+            for rule in rules:
+                selector, attr = _split(rule)
+                elem = card.css_first(selector) if selector else card
+                if elem is None:
+                    continue
+                value = elem.attributes.get(attr) if attr else elem.text(strip=True)
+                if value:
+                    record[field] = value
+                    break
+        cards.append(record)
+    return cards
+
+
+def available_backends() -> List[str]:
+    backends = []
+    if HTMLParser is not None:
+        backends.append('selectolax')
+    if HAS_LXML:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+
+# Fastest installed backend unless HTML_BACKEND picks one explicitly
+DEFAULT_BACKEND = os.getenv('HTML_BACKEND') or available_backends()[0]
+
+
+def extract_cards(content, table: Dict, backend: str = None) -> List[Dict]:
+    """
+    Parses a listing page and returns one dict per card with every field in the table
+    (None where no rule matched). BeautifulSoup backends only build the card subtrees.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'selectolax':
+        return _extract_selectolax(content, table)
+    if backend in ('lxml', 'html.parser'):
+        return _extract_bs4(content, table, backend)
+    raise ValueError(f"Unknown HTML backend: {backend}")
@@ -0,0 +1,189 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    from http_client import HttpClient, get_default_client
+except ImportError:
+    from src.http_client import HttpClient, get_default_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "data/http_cache"
+# Upper bound for stored bodies; least recently used entries are evicted past it
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+class CachedResponse:
+    """
+    Result of a conditional GET. On a 304 `not_modified` is True and the body is the one
+    stored from the last 200. Callers parse it like a fresh body: the run that received
+    that 200 may have crashed or been cut off before storing its items, and downstream
+    dedupe drops the ones that were stored.
+    `open()` gives a binary stream over the body without loading it into memory.
+    """
+
+    def __init__(self, status_code, content=None, not_modified=False, response=None, path=None):
+        self.status_code = status_code
+        self._content = content
+        self.not_modified = not_modified
+        self.response = response
+        self.path = path
+
+    @property
+    def content(self):
+        if self._content is None:
+            if self.path is not None:
+                with open(self.path, 'rb') as f:
+                    self._content = f.read()
+            elif self.response is not None:
+                self._content = self.response.content
+        return self._content
+
+    def open(self):
+        if self.path is not None:
+            return open(self.path, 'rb')
+        if self._content is not None:
+            return io.BytesIO(self._content)
+        # Uncached streamed response: read straight off the socket, decompressed
+        self.response.raw.decode_content = True
+        return self.response.raw
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.response is not None and not self.not_modified:
+            self.response.raise_for_status()
+
+
+class HttpCache:
+    """
+    On-disk conditional-GET cache keyed by URL.
+    Stores the ETag / Last-Modified validators and body of every 200 that carried one,
+    sends If-None-Match / If-Modified-Since on the next request, and keeps the total
+    stored size under `max_bytes` with LRU eviction. A 304 saves the download, not the
+    parse: the stored body is served in its place.
+    """
+
+    def __init__(self, cache_dir: str = None, client: HttpClient = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.path.join(os.getcwd(), CACHE_DIR)
+        self.client = client or get_default_client()
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(self.cache_dir, "index.json")
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self):
+        tmp = self.index_file + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_file)
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".body")
+
+    def get(self, url: str, headers: dict = None, stream: bool = False, **kwargs) -> CachedResponse:
+        """
+        Conditional GET for `url`. With `stream=True` the body is written to the cache
+        in chunks instead of being held in memory; read it back with `open()`.
+        """
+        headers = dict(headers or {})
+        body_path = self._body_path(url)
+        with self._lock:
+            entry = self.index.get(url)
+        has_body = entry is not None and os.path.exists(body_path)
+
+        if has_body:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.client.get(url, headers=headers, stream=stream, **kwargs)
+
+        if response.status_code == 304 and has_body:
+            logger.info(f"Not modified, reading cached body: {url}")
+            self._touch(url, response)
+            return CachedResponse(200, not_modified=True, response=response, path=body_path)
+
+        if response.status_code == 200:
+            path = self._store(url, response, stream)
+            if stream:
+                return CachedResponse(200, response=response, path=path)
+        return CachedResponse(response.status_code, response=response)
+
+    def _touch(self, url, response):
+        with self._lock:
+            entry = self.index.get(url)
+            if entry is None:
+                return
+            entry['last_used'] = time.time()
+            # Servers may rotate validators on a 304
+            entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+            entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+            self._save_index()
+
+    def _store(self, url, response, stream=False):
+        """Writes a cacheable 200 to disk and returns the body path, or None if not cached."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        if not (etag or last_modified) or (not stream and len(response.content) > self.max_bytes):
+            # Nothing to revalidate with (or too big to keep): forget any stale copy
+            with self._lock:
+                if self.index.pop(url, None) is not None:
+                    self._remove_body(url)
+                    self._save_index()
+            return None
+
+        path = self._body_path(url)
+        tmp = path + ".part"
+        size = 0
+        with open(tmp, 'wb') as f:
+            chunks = response.iter_content(64 * 1024) if stream else [response.content]
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self.index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': size,
+                'last_used': time.time(),
+            }
+            self._evict(keep=url)
+            self._save_index()
+        return path
+
+    def _evict(self, keep=None):
+        total = sum(entry['size'] for entry in self.index.values())
+        for url, entry in sorted(self.index.items(), key=lambda kv: kv[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if url == keep:
+                continue
+            total -= entry['size']
+            del self.index[url]
+            self._remove_body(url)
+            logger.debug(f"Evicted {url} from HTTP cache")
+
+    def _remove_body(self, url):
+        try:
+            os.remove(self._body_path(url))
+        except FileNotFoundError:
+            pass
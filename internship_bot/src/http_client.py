@@ -0,0 +1,106 @@
+import logging
+import os
+import threading
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+try:
+    from http_replay import cassette_adapter, StubAdapter, TELEGRAM_API
+except ImportError:
+    from src.http_replay import cassette_adapter, StubAdapter, TELEGRAM_API
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_TIMEOUT = 15
+# Number of distinct hosts kept in the pool manager, and keep-alive connections kept per host
+POOL_HOSTS = 32
+POOL_MAXSIZE = 10
+
+
+class HttpClient:
+    """
+    Shared HTTP client for every scraper and Telegram sender.
+    Wraps one requests.Session so connections are pooled per host and kept alive
+    between requests, and applies a central User-Agent, compression negotiation
+    (gzip, plus brotli when the brotli package is installed) and a default timeout.
+    `adapter` replaces the network transport; when HTTP_CASSETTE is set, exchanges are
+    recorded to or replayed from that cassette (see http_replay), and the Telegram API
+    is stubbed so neither mode ever posts.
+    """
+
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT, timeout: float = DEFAULT_TIMEOUT,
+                 pool_maxsize: int = POOL_MAXSIZE, adapter: HTTPAdapter = None):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': ACCEPT_ENCODING,
+        })
+        if adapter is None and os.getenv('HTTP_CASSETTE'):
+            adapter = cassette_adapter(os.getenv('HTTP_CASSETTE'), os.getenv('HTTP_CASSETTE_MODE', 'replay'),
+                                       latency=float(os.getenv('HTTP_REPLAY_LATENCY', '0')),
+                                       pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize)
+            self.session.mount(TELEGRAM_API, StubAdapter())
+        self.adapter = adapter or HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self._lock = threading.Lock()
+        self._requests = {}
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._requests[host] = self._requests.get(host, 0) + 1
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Per-host counts of requests made, connections opened and connections reused.
+        Reuse is requests minus opened, so it only counts requests that skipped a handshake.
+        """
+        opened = {}
+        for key in list(self.adapter.poolmanager.pools.keys()):
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            opened[host] = opened.get(host, 0) + pool.num_connections
+
+        stats = {}
+        with self._lock:
+            for host, count in self._requests.items():
+                conns = opened.get(host, 0)
+                stats[host] = {'requests': count, 'opened': conns, 'reused': max(count - conns, 0)}
+        return stats
+
+    def log_stats(self):
+        for host, s in sorted(self.connection_stats().items()):
+            logger.info(f"HTTP {host}: {s['requests']} requests, {s['opened']} connections opened, {s['reused']} reused")
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_default_client() -> HttpClient:
+    """Process-wide client used by components that were not given one explicitly."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
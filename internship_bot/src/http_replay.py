@@ -0,0 +1,188 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+# HTTP_CASSETTE=path/to/run.jsonl.gz with HTTP_CASSETTE_MODE=record|replay swaps the
+# transport of every HttpClient, so the unchanged pipelines can be recorded or replayed.
+RECORD, REPLAY = 'record', 'replay'
+# Never recorded or replayed: while a cassette is in use, Telegram calls get StubAdapter's reply
+TELEGRAM_API = 'https://api.telegram.org/'
+# Bot tokens are part of Telegram API paths; never write them to a cassette
+_TOKEN_RE = re.compile(r'/bot[^/]+/')
+# Headers that describe the wire encoding, which no longer applies to the stored (decoded) body
+_WIRE_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+def _redact(url):
+    return _TOKEN_RE.sub('/bot<token>/', url)
+
+
+def _body_hash(body):
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha1(body).hexdigest()
+
+
+def _raw_response(status, headers, body):
+    """A urllib3 response over an in-memory body, so requests can stream or read it as usual."""
+    return HTTPResponse(body=io.BytesIO(body), headers=headers, status=status,
+                        preload_content=False, decode_content=False)
+
+
+class Cassette:
+    """
+    Gzip-compressed JSON-lines store of HTTP exchanges.
+    Exchanges are keyed by method, URL (with bot tokens redacted) and a hash of the
+    request body; repeated requests to the same key are replayed in recorded order.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._exchanges = {}
+        self._cursor = {}
+
+    def load(self):
+        self._exchanges = {}
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                exchange = json.loads(line)
+                key = (exchange['method'], exchange['url'], exchange['body_sha1'])
+                self._exchanges.setdefault(key, []).append(exchange)
+        logger.info(f"Loaded {sum(map(len, self._exchanges.values()))} recorded exchanges from {self.path}")
+        return self
+
+    def rewind(self):
+        """Replays every key from its first recorded response again."""
+        with self._lock:
+            self._cursor = {}
+
+    def truncate(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with gzip.open(self.path, 'wt', encoding='utf-8'):
+            pass
+        return self
+
+    def append(self, request, status, headers, body, elapsed):
+        exchange = {
+            'method': request.method,
+            'url': _redact(request.url),
+            'body_sha1': _body_hash(request.body),
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in _WIRE_HEADERS},
+            'body': base64.b64encode(body).decode('ascii'),
+            'elapsed': elapsed,
+        }
+        # Every append is its own gzip member, so a crash mid-run keeps what was recorded
+        with self._lock, gzip.open(self.path, 'at', encoding='utf-8') as f:
+            f.write(json.dumps(exchange) + '\n')
+
+    def next(self, request):
+        """The next recorded exchange for `request`, or None. Falls back to method + URL for POST bodies that changed."""
+        url = _redact(request.url)
+        key = (request.method, url, _body_hash(request.body))
+        with self._lock:
+            if key not in self._exchanges:
+                key = next((k for k in self._exchanges if k[:2] == key[:2]), None)
+                if key is None:
+                    return None
+            recorded = self._exchanges[key]
+            index = self._cursor.get(key, 0)
+            # Past the end, keep answering with the last recorded response
+            self._cursor[key] = index + 1
+            return recorded[min(index, len(recorded) - 1)]
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests over the network as usual and appends every exchange to a cassette."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        body = response.content
+        self.cassette.append(request, response.status_code, response.headers, body,
+                             response.elapsed.total_seconds())
+        # The socket is drained; give streaming callers the decoded body instead
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS}
+        response.raw = _raw_response(response.status_code, headers, body)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Answers every request from a cassette without touching the network.
+    Unrecorded requests fail with a ConnectionError, like an unreachable host would.
+    `latency` scales the recorded response times (0 replays as fast as possible).
+    """
+
+    def __init__(self, cassette: Cassette, latency: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        exchange = self.cassette.next(request)
+        if exchange is None:
+            raise requests.ConnectionError(f"No recorded response for {request.method} {_redact(request.url)}",
+                                           request=request)
+        if self.latency:
+            time.sleep(exchange['elapsed'] * self.latency)
+        raw = _raw_response(exchange['status'], exchange['headers'], base64.b64decode(exchange['body']))
+        return self.build_response(request, raw)
+
+
+class StubAdapter(HTTPAdapter):
+    """Answers every request with a fixed response, e.g. to stand in for the Telegram API."""
+
+    def __init__(self, status: int = 200, body: bytes = b'{"ok": true, "result": {}}', **kwargs):
+        super().__init__(**kwargs)
+        self.status = status
+        self.body = body
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        raw = _raw_response(self.status, {'Content-Type': 'application/json'}, self.body)
+        return self.build_response(request, raw)
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def _open_cassette(path, mode):
+    # Every client in the process shares one cassette, so a second client doesn't truncate the first's recording
+    with _cassettes_lock:
+        key = (os.path.abspath(path), mode)
+        if key not in _cassettes:
+            cassette = Cassette(path)
+            _cassettes[key] = cassette.truncate() if mode == RECORD else cassette.load()
+        return _cassettes[key]
+
+
+def cassette_adapter(path: str, mode: str = REPLAY, latency: float = 0.0, **kwargs) -> HTTPAdapter:
+    """Builds the record or replay transport for the cassette at `path`."""
+    if mode == RECORD:
+        logger.info(f"Recording HTTP exchanges to {path}")
+        return RecordingAdapter(_open_cassette(path, mode), **kwargs)
+    if mode == REPLAY:
+        return ReplayAdapter(_open_cassette(path, mode), latency=latency, **kwargs)
+    raise ValueError(f"Unknown cassette mode: {mode}")
@@ -4,6 +4,7 @@ import logging
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ApplicationBuilder, ContextTypes, CommandHandler, CallbackQueryHandler
 from database import Database
+from rate_limiter import RateLimiter
 from filters import COUNTRIES, STEM_FIELDS
 
 # Configure logging
@@ -14,13 +15,15 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 db = Database()
+# Counted in memory; the database is written in batches by a background thread
+limiter = RateLimiter(db)
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     keyboard = [
         [InlineKeyboardButton("Running Internship Search 🚀", callback_data='start_search')]
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.message.reply_text("Welcome to the Internship Bot! 🤖\nClick below to find internships:", reply_markup=reply_markup)
+    await update.message.reply_text("Welcome to the Internship Bot! 🤖\nClick below to find internships, or search by keyword with /search:", reply_markup=reply_markup)
 
 async def button(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
@@ -65,34 +68,58 @@ async def button(update: Update, context: ContextTypes.DEFAULT_TYPE):
         country = context.user_data.get('country', 'All')
 
         # Check Rate Limit
-        allowed, count = db.check_rate_limit(user_id)
+        allowed, count = limiter.check(user_id)
         if not allowed:
-            await query.edit_message_text(text=f"⚠️ You have reached your daily limit of 100 requests.\nPlease try again tomorrow.")
+            await query.edit_message_text(text=limit_message())
             return
 
         await query.edit_message_text(text=f"🔍 Searching for {selected_field} internships in {country}...")
 
         # Perform Search
         results = db.search_internships(country=country, field=selected_field, limit=5)
+        await send_results(context, user_id, results, count)
+
+async def search(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/search <keywords>: full-text search, e.g. /search rust embedded berlin"""
+    user_id = update.effective_user.id
+    keywords = ' '.join(context.args or [])
+    if not keywords:
+        await update.message.reply_text("Usage: /search <keywords>\nExample: /search rust embedded berlin")
+        return
 
-        if not results:
-            await context.bot.send_message(chat_id=user_id, text="No internships found matching your criteria at the moment. Try again later!")
-            return
+    # Check Rate Limit
+    allowed, count = limiter.check(user_id)
+    if not allowed:
+        await update.message.reply_text(limit_message())
+        return
+
+    results = db.full_text_search(keywords, limit=5)
+    await send_results(context, update.effective_chat.id, results, count)
+
+def limit_message():
+    # The limit is a rolling 24-hour window, so requests free up gradually rather than at midnight
+    return (f"⚠️ You have reached the limit of {limiter.limit} requests in 24 hours.\n"
+            f"Please try again in a few hours, as your earlier requests age out.")
+
+async def send_results(context: ContextTypes.DEFAULT_TYPE, chat_id, results, count):
+    if not results:
+        await context.bot.send_message(chat_id=chat_id, text="No internships found matching your criteria at the moment. Try again later!")
+        return
 
-        for internship in results:
-            msg = (
-                f"🚀 <b>{internship.title}</b>\n"
-                f"🏢 {internship.company}\n"
-                f"📍 {internship.location}\n"
-                f"📅 {internship.date_posted.strftime('%Y-%m-%d') if internship.date_posted else 'N/A'}\n"
-                f"👇 <b>Apply Here:</b>\n{internship.link}"
-            )
-            try:
-                await context.bot.send_message(chat_id=user_id, text=msg, parse_mode='HTML', disable_web_page_preview=True)
-            except Exception as e:
-                logger.error(f"Failed to send message: {e}")
-
-        await context.bot.send_message(chat_id=user_id, text=f"✅ Sent top {len(results)} results.\nDaily Requests: {count}/100")
+    for internship in results:
+        msg = (
+            f"🚀 <b>{internship.title}</b>\n"
+            f"🏢 {internship.company}\n"
+            f"📍 {internship.location}\n"
+            f"📅 {internship.date_posted.strftime('%Y-%m-%d') if internship.date_posted else 'N/A'}\n"
+            f"👇 <b>Apply Here:</b>\n{internship.link}"
+        )
+        try:
+            await context.bot.send_message(chat_id=chat_id, text=msg, parse_mode='HTML', disable_web_page_preview=True)
+        except Exception as e:
+            logger.error(f"Failed to send message: {e}")
+
+    await context.bot.send_message(chat_id=chat_id, text=f"✅ Sent top {len(results)} results.\nRequests in the last 24 hours: about {count}/{limiter.limit}")
 
 def main():
     bot_token = os.getenv('BOT_TOKEN')
@@ -103,10 +130,17 @@ def main():
     application = ApplicationBuilder().token(bot_token).build()
 
     application.add_handler(CommandHandler('start', start))
+    application.add_handler(CommandHandler('search', search))
     application.add_handler(CallbackQueryHandler(button))
 
     logger.info("Bot is polling...")
-    application.run_polling()
+    try:
+        application.run_polling()
+    finally:
+        # Saves the counters changed since the last flush
+        limiter.close()
+        stats = db.cache_stats()
+        logger.info(f"Search cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,101 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List
+
+try:
+    from politeness import HostScheduler
+    from health import SourceUnavailable
+except ImportError:
+    from src.politeness import HostScheduler
+    from src.health import SourceUnavailable
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://internshala.com/internships/{category}-internship/"
+# Internshala category slugs to crawl, e.g. INTERNSHALA_CATEGORIES="computer-science,data-science"
+INTERNSHALA_CATEGORIES = [c.strip() for c in os.getenv(
+    'INTERNSHALA_CATEGORIES',
+    'computer-science,data-science,machine-learning,web-development,electronics,mechanical,engineering'
+).split(',') if c.strip()]
+INTERNSHALA_MAX_PAGES = int(os.getenv('INTERNSHALA_MAX_PAGES', '3'))
+# Seconds after which no new page requests are started; keep below runner.DEFAULT_SOURCE_TIMEOUT
+CRAWL_DEADLINE = 25
+
+
+def page_url(category: str, page: int) -> str:
+    url = BASE_URL.format(category=category)
+    return url if page == 1 else f"{url}page-{page}/"
+
+
+class InternshalaCrawler:
+    """
+    Crawls a set of Internshala categories to a fixed page depth through a HostScheduler.
+    Categories are crawled in parallel (the scheduler keeps the host load polite) and
+    each category stops early at the first page with no new listings.
+    `parse_page(content, category)` turns one listing page into result dicts with a 'link' key.
+    """
+
+    def __init__(self, scheduler: HostScheduler, categories: List[str] = None,
+                 max_pages: int = INTERNSHALA_MAX_PAGES, deadline: float = CRAWL_DEADLINE):
+        self.scheduler = scheduler
+        self.categories = categories or INTERNSHALA_CATEGORIES
+        self.max_pages = max_pages
+        self.deadline = deadline
+
+    def crawl(self, parse_page: Callable[[bytes, str], List[Dict]]) -> List[Dict]:
+        return list(self.iter_crawl(parse_page))
+
+    def iter_crawl(self, parse_page: Callable[[bytes, str], List[Dict]]) -> Iterator[Dict]:
+        """Like crawl, but yields each category's listings as soon as that category finishes."""
+        deadline = time.monotonic() + self.deadline
+        seen = set()
+        seen_lock = threading.Lock()
+        fetched, failed = [0], [0]
+
+        def crawl_category(category):
+            found = []
+            for page in range(1, self.max_pages + 1):
+                url = page_url(category, page)
+                try:
+                    response = self.scheduler.get(url, deadline=deadline, timeout=15)
+                    response.raise_for_status()
+                except TimeoutError:
+                    logger.info(f"Crawl deadline reached before {url}")
+                    break
+                except Exception as e:
+                    logger.error(f"Internshala page failed {url}: {e}")
+                    with seen_lock:
+                        failed[0] += 1
+                    break
+
+                with seen_lock:
+                    fetched[0] += 1
+
+                items = parse_page(response.content, category)
+                new = []
+                with seen_lock:
+                    for item in items:
+                        if item['link'] not in seen:
+                            seen.add(item['link'])
+                            new.append(item)
+                logger.info(f"Internshala {category} page {page}: {len(new)} new listings")
+                if not new:
+                    break
+                found.extend(new)
+            return found
+
+        total = 0
+        with ThreadPoolExecutor(max_workers=len(self.categories) or 1) as executor:
+            futures = [executor.submit(crawl_category, category) for category in self.categories]
+            for future in as_completed(futures):
+                found = future.result()
+                total += len(found)
+                yield from found
+
+        if failed[0] and not fetched[0]:
+            raise SourceUnavailable(f"every Internshala page request failed ({failed[0]})")
+
+        logger.info(f"Internshala crawl: {total} listings from {len(self.categories)} categories")
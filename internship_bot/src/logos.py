@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+try:
+    from http_client import HttpClient, get_default_client
+except ImportError:
+    from src.http_client import HttpClient, get_default_client
+
+logger = logging.getLogger(__name__)
+
+LOGO_CACHE_FILE = "data/logo_cache.json"
+# A logo that worked is trusted this long; a missing one is retried sooner
+POSITIVE_TTL = 30 * 24 * 3600
+NEGATIVE_TTL = 7 * 24 * 3600
+MAX_WORKERS = 8
+# Telegram fetches photo URLs itself and rejects anything larger
+MAX_PHOTO_BYTES = 5 * 1024 * 1024
+
+
+def _company_key(internship):
+    return ' '.join((internship.get('company') or '').lower().split())
+
+
+class LogoResolver:
+    """
+    Decides before posting whether an internship has a usable logo.
+    The candidate URL (the item's `logo`) is fetched once and accepted only if it
+    answers 200 with an image small enough for Telegram. Results, positive and
+    negative, are cached per company and persisted, and expire after POSITIVE_TTL or
+    NEGATIVE_TTL. `prefetch` checks a batch of pending posts concurrently, so the
+    poster can pick sendPhoto or sendMessage up front and make one call per post.
+    """
+
+    def __init__(self, client: HttpClient = None, cache_file: str = None,
+                 positive_ttl: float = POSITIVE_TTL, negative_ttl: float = NEGATIVE_TTL,
+                 max_workers: int = MAX_WORKERS):
+        self.client = client or get_default_client()
+        self.cache_file = cache_file or os.path.join(os.getcwd(), LOGO_CACHE_FILE)
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        # company -> {'candidate': URL checked, 'url': it if usable else None, 'checked': unix time}
+        self.records: Dict[str, Dict] = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self.records, f, indent=2)
+            os.replace(tmp, self.cache_file)
+
+    def _fresh(self, key, candidate):
+        record = self.records.get(key)
+        if record is None or record.get('candidate') != candidate:
+            return None
+        ttl = self.positive_ttl if record['url'] else self.negative_ttl
+        return record if time.time() - record['checked'] < ttl else None
+
+    def _validate(self, url):
+        try:
+            with self.client.get(url, stream=True, allow_redirects=True) as response:
+                if response.status_code != 200:
+                    return False
+                if not response.headers.get('Content-Type', '').startswith('image/'):
+                    return False
+                length = response.headers.get('Content-Length')
+                return length is None or int(length) <= MAX_PHOTO_BYTES
+        except Exception as e:
+            logger.debug(f"Logo check failed for {url}: {e}")
+            return False
+
+    def _check(self, key, candidate):
+        ok = self._validate(candidate)
+        with self._lock:
+            self.records[key] = {'candidate': candidate, 'url': candidate if ok else None, 'checked': time.time()}
+
+    def prefetch(self, internships: Iterable[Dict]):
+        """Checks, concurrently, the logo of every company in `internships` without a fresh cached result."""
+        todo = {}
+        for internship in internships:
+            key, candidate = _company_key(internship), internship.get('logo')
+            if candidate and self._fresh(key, candidate) is None:
+                todo[key] = candidate
+        if not todo:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(todo))) as pool:
+            list(pool.map(lambda kv: self._check(*kv), todo.items()))
+        found = sum(1 for key in todo if self.records[key]['url'])
+        logger.info(f"Checked {len(todo)} logos, {found} usable.")
+
+    def logo_for(self, internship: Dict) -> Optional[str]:
+        """The usable logo URL for this internship, or None to post it as text."""
+        key, candidate = _company_key(internship), internship.get('logo')
+        if not candidate:
+            return None
+        record = self._fresh(key, candidate)
+        if record is None:
+            self._check(key, candidate)
+            record = self.records[key]
+        return record['url']
+
+    def mark_bad(self, internship: Dict):
+        """Records that Telegram rejected this company's logo despite the check."""
+        with self._lock:
+            self.records[_company_key(internship)] = {'candidate': internship.get('logo'), 'url': None,
+                                                      'checked': time.time()}
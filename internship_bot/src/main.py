@@ -9,16 +9,105 @@ from database import Database
 from bot import TelegramBot
 from filters import extract_country, classify_field
 from utils import parse_date
+from runner import stream_sources
+from health import SourceHealth
+from http_client import HttpClient
+from http_cache import HttpCache
+from near_duplicates import NearDuplicateStore, minhash
+from backfill import map_chunks, iter_records, CHUNK_SIZE
+
+# Rows buffered before one bulk insert while streaming
+INSERT_BATCH = 200
+# Seconds between channel posts (Telegram rate limits); replays of recorded runs set POST_DELAY=0
+POST_DELAY = float(os.getenv('POST_DELAY', '3'))
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def build_scrapers(client, cache):
+    return [
+        LinkedInScraper(client=client),
+        InternshalaScraper(client=client),
+        RemotiveScraper(client=client, cache=cache),
+        RSSScraper(url="https://weworkremotely.com/categories/remote-programming-jobs.rss", source_name="WeWorkRemotely", client=client, cache=cache),
+        RSSScraper(url="https://stackoverflow.com/jobs/feed", source_name="StackOverflow", client=client, cache=cache)
+    ]
+
+def prepare_internship(i):
+    """Enriches a scraped item into the row stored by Database.add_internships_bulk."""
+    title = i.get('title', 'N/A')
+    location = i.get('location', 'Unknown')
+
+    # Enrich data
+    country = extract_country(location)
+    field = classify_field(title, i.get('tags'))
+
+    # Parse date
+    date_str = i.get('date', '')
+    date_obj = parse_date(date_str)
+
+    return {
+        'title': title,
+        'company': i.get('company', 'N/A'),
+        'location': location,
+        'link': i.get('link'),
+        'date_obj': date_obj,
+        'source': i.get('source', 'Web'),
+        'country': country,
+        'field': field,
+        'tags': i.get('tags')
+    }
+
+def prepare_chunk(items):
+    """Backfill worker task: enriches a chunk and computes each row's MinHash signature."""
+    prepared = []
+    for i in items:
+        data = prepare_internship(i)
+        data['minhash'] = minhash(data['title'], data['company'])
+        prepared.append(data)
+    return prepared
+
+def backfill(path, workers=None):
+    """
+    Imports a historical dump (JSON array, or JSON lines) of scraped items into the
+    database without posting anything. Enrichment runs on a process pool; rows come
+    back in file order and are deduplicated and stored as they arrive.
+    """
+    db = Database()
+    near_duplicates = NearDuplicateStore()
+    saved = 0
+    batch = []
+
+    def store(batch):
+        new = len(db.add_internships_bulk(batch))
+        # Only rows that are in the database are remembered as seen
+        near_duplicates.confirm(data['link'] for data in batch)
+        near_duplicates.save()
+        return new
+
+    for data in map_chunks(prepare_chunk, iter_records(path), workers):
+        if near_duplicates.check(data['link'], data['title'], data['company'], data.pop('minhash'),
+                                 data['location']) is not None:
+            continue
+        batch.append(data)
+        if len(batch) >= CHUNK_SIZE:
+            saved += store(batch)
+            batch = []
+    saved += store(batch)
+    logger.info(f"Backfill completed. Saved {saved} new internships to DB.")
+
 def main():
     parser = argparse.ArgumentParser(description="Internship Finder Bot")
     parser.add_argument('--dry-run', action='store_true', help="Run without sending messages or saving history")
+    parser.add_argument('--backfill', metavar='FILE', help="Import a dump of scraped items (.json or .jsonl) instead of scraping")
+    parser.add_argument('--workers', type=int, help="Processes used by --backfill (default: one per core)")
     args = parser.parse_args()
 
+    if args.backfill:
+        backfill(args.backfill, args.workers)
+        return
+
     # Load configuration
     bot_token = os.getenv('BOT_TOKEN')
     channel_id = os.getenv('CHANNEL_ID')
@@ -29,79 +118,75 @@ def main():
 
     # Initialize modules
     db = Database()
-    bot = TelegramBot(bot_token, channel_id)
+    # Catches the same role arriving from several sources under different links
+    near_duplicates = NearDuplicateStore()
+    client = HttpClient()
+    cache = HttpCache(client=client)
+    bot = TelegramBot(bot_token, channel_id, client=client)
 
     # Initialize Scrapers
-    scrapers = [
-        LinkedInScraper(),
-        InternshalaScraper(),
-        RemotiveScraper(),
-        RSSScraper(url="https://weworkremotely.com/categories/remote-programming-jobs.rss", source_name="WeWorkRemotely"),
-        RSSScraper(url="https://stackoverflow.com/jobs/feed", source_name="StackOverflow") 
-    ]
+    scrapers = build_scrapers(client, cache)
 
-    # Run all scrapers
-    scraped_data = []
-    for scraper in scrapers:
-        try:
-            results = scraper.scrape()
-            if results:
-                scraped_data.append(results)
-                logger.info(f"{scraper.__class__.__name__}: Found {len(results)} items")
-        except Exception as e:
-            logger.error(f"Scraper {scraper.__class__.__name__} failed: {e}")
-
-    # Flatten results
-    import itertools
-    all_internships = [item for items in scraped_data for item in items]
+    # Run all scrapers concurrently and store items as they arrive;
+    # items from a source that fails or runs late are kept up to that point.
+    sources = [(getattr(scraper, 'source_name', scraper.__class__.__name__), scraper.stream) for scraper in scrapers]
 
     new_count = 0
     max_broadcast_posts = 5 # Limit for channel broadcasting
     processed_count = 0
+    to_broadcast = []
+
+    # Scraped item and DB row for each item waiting for the next bulk insert
+    batch = []
+
+    def flush():
+        nonlocal new_count
+        # One transaction for the whole batch; returns only the links that were not stored yet
+        new_links = set(db.add_internships_bulk([data for _, data in batch]))
+        # Only rows that are in the database are remembered as seen, so a failed insert is retried next run
+        near_duplicates.confirm(data['link'] for _, data in batch)
+        near_duplicates.save()
+        for i, internship_data in batch:
+            if internship_data['link'] not in new_links:
+                continue
+            new_links.discard(internship_data['link'])
+            logger.info(f"New internship saved: {internship_data['title']} ({internship_data['country']}, {internship_data['field']})")
 
-    for i in all_internships:
+            # Queue for broadcast (Limit to max_broadcast_posts per run for channel spam prevention).
+            # Sending happens after scraping so the rate-limit sleeps don't stall the sources.
+            if len(to_broadcast) < max_broadcast_posts:
+                to_broadcast.append(i)
+                new_count += 1
+        batch.clear()
+
+    for source_name, i in stream_sources(sources, health=SourceHealth()):
         # Prepare data for DB
-        title = i.get('title', 'N/A')
-        location = i.get('location', 'Unknown')
-        
-        # Enrich data
-        country = extract_country(location)
-        field = classify_field(title)
-        
-        # Parse date
-        date_str = i.get('date', '')
-        date_obj = parse_date(date_str)
-        
-        internship_data = {
-            'title': title,
-            'company': i.get('company', 'N/A'),
-            'location': location,
-            'link': i.get('link'),
-            'date_obj': date_obj,
-            'source': i.get('source', 'Web'),
-            'country': country,
-            'field': field
-        }
-
-        # Add to Database
-        # Returns True if it matches unique constraint (link) and was added
-        is_new = db.add_internship(internship_data)
+        internship_data = prepare_internship(i)
+
+        canonical = near_duplicates.check(internship_data['link'], internship_data['title'], internship_data['company'],
+                                          location=internship_data['location'])
+        if canonical is not None:
+            if canonical != internship_data['link']:
+                logger.info(f"Near-duplicate of {canonical}, skipping: {internship_data['title']}")
+            continue
+
+        batch.append((i, internship_data))
+        if len(batch) >= INSERT_BATCH:
+            flush()
+    flush()
+
+    for i in to_broadcast:
+        if not args.dry_run:
+            message = bot.format_internship(i)
+            bot.send_message(message, link=i.get('link'))
+            time.sleep(POST_DELAY) # Rate limit protection
+        else:
+             logger.info("[Dry Run] Would send to channel")
         
-        if is_new:
-            logger.info(f"New internship saved: {title} ({country}, {field})")
-            
-            # Broadcast to Channel (Limit to max_broadcast_posts per run for channel spam prevention)
-            if processed_count < max_broadcast_posts:
-                if not args.dry_run:
-                    message = bot.format_internship(i)
-                    bot.send_message(message, link=i.get('link'))
-                    time.sleep(3) # Rate limit protection
-                else:
-                     logger.info("[Dry Run] Would send to channel")
-                
-                processed_count += 1
-                new_count += 1
+        processed_count += 1
         
+    near_duplicates.save()
+    client.log_stats()
     logger.info(f"Job completed. Saved {new_count} new internships to DB. Broadcasted {processed_count}.")
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 
+import argparse
 import logging
 import os
 import sys
+import time
 
 # Ensure src is in path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -9,44 +11,61 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.processor import Processor
 from src.scraper_engine import ContentScraper
 from src.poster import Poster
+from src.http_client import HttpClient
+from src.http_cache import HttpCache
+from src.backfill import iter_records
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds between channel posts; replays of recorded runs set POST_DELAY=0
+POST_DELAY = float(os.getenv('POST_DELAY', '5'))
+
 def main():
+    parser = argparse.ArgumentParser(description="Daily Internship Pipeline")
+    parser.add_argument('--backfill', metavar='FILE', help="Import a dump of raw items (.json or .jsonl) instead of scraping and posting")
+    parser.add_argument('--workers', type=int, help="Processes used by --backfill (default: one per core)")
+    args = parser.parse_args()
+
+    if args.backfill:
+        logger.info(f"Backfilling from {args.backfill}...")
+        Processor().backfill(iter_records(args.backfill), workers=args.workers)
+        return
+
     logger.info("Starting Daily Internship Pipeline...")
 
     # 1. Initialize Components
     processor = Processor()
-    scraper = ContentScraper()
-    poster = Poster(os.getenv('BOT_TOKEN'), os.getenv('CHANNEL_ID'))
-
-    # 2. Scrape Data
-    logger.info("Step 1: Scraping...")
-    print(f"DEBUG: Scraper Type: {type(scraper)}")
-    print(f"DEBUG: Scraper Module: {scraper.__module__}")
-    raw_data = scraper.run_all()
-    logger.info(f"Scraped {len(raw_data)} potential internships.")
-
-    # 3. Process & Deduplicate
-    logger.info("Step 2: Processing...")
-    added_count = processor.process_batch(raw_data)
-    logger.info(f"Added {added_count} new unique internships to database.")
-
-    # 4. Post to Telegram (Rate Limited)
-    logger.info("Step 3: Posting...")
-    pending = processor.get_pending_posts(limit=4) # ~4 per run * 4 runs = 16/day (close to 15)
-    
-    posted_count = 0
-    for internship in pending:
-        success = poster.post_internship(internship)
-        if success:
-            processor.mark_as_posted(internship['id'])
-            posted_count += 1
-            import time
-            time.sleep(5) # Delay between posts
+    client = HttpClient()
+    scraper = ContentScraper(client=client, cache=HttpCache(client=client))
+    poster = Poster(os.getenv('BOT_TOKEN'), os.getenv('CHANNEL_ID'), client=client)
+
+    # One unit of work for the whole run: the store is loaded once (above) and
+    # new and posted internships are committed in a single write when it ends.
+    with processor.session():
+        # 2. Scrape, Process & Deduplicate
+        # Items are normalized and stored as they arrive, while slower sources are still fetching.
+        logger.info("Step 1+2: Scraping & Processing...")
+        added_count = processor.process_stream(scraper.stream_all())
+        logger.info(f"Added {added_count} new unique internships to database.")
+
+        # 4. Post to Telegram (Rate Limited)
+        logger.info("Step 3: Posting...")
+        pending = processor.get_pending_posts(limit=4) # ~4 per run * 4 runs = 16/day (close to 15)
+        # Logos are checked up front, in parallel, so each post is one Telegram call
+        poster.prefetch_logos(pending)
+        
+        posted_count = 0
+        for internship in pending:
+            success = poster.post_internship(internship)
+            if success:
+                processor.mark_as_posted(internship['id'])
+                posted_count += 1
+                time.sleep(POST_DELAY) # Delay between posts
 
+    poster.logos.save()
+    client.log_stats()
     logger.info(f"Pipeline Complete. Posted {posted_count} internships.")
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUPLICATES_FILE = "data/near_duplicates.jsonl"
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs above ~0.5 estimated similarity become candidates
+BANDS = 16
+# Candidates are confirmed by MinHash similarity of title + company shingles...
+THRESHOLD = 0.5
+# ...the share of (stemmed) title words in common...
+TITLE_THRESHOLD = 0.7
+# ...and the share of company words in common
+COMPANY_THRESHOLD = 0.5
+SHINGLE = 3
+# 64 32-bit hash values per shingle: four keyed blake2b digests. Signatures are
+# persisted, so these keys must never change.
+_HASH_KEYS = [bytes([k]) for k in range(NUM_PERM // 16)]
+
+_PUNCT = re.compile(r'[^\w\s]+')
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'gmbh', 'corp', 'corporation', 'co', 'company',
+                    'plc', 'ag', 'sa', 'bv', 'the'}
+# Words that say nothing about where it is
+LOCATION_STOPWORDS = {'remote', 'hybrid', 'onsite', 'on', 'site', 'office', 'or', 'and', 'in', 'the', 'area'}
+# Words that say nothing about which role it is
+TITLE_STOPWORDS = {'intern', 'internship', 'trainee', 'summer', 'winter', 'spring', 'fall', 'autumn',
+                   'remote', 'the', 'and', 'of', 'for', 'in', 'at', 'a', 'an', 'to', 'with'}
+
+
+def _words(text):
+    return _PUNCT.sub(' ', (text or '').lower()).split()
+
+
+def _stem(word):
+    for suffix in ('ship', 'ing', 's'):
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            return word[:-len(suffix)]
+    return word
+
+
+def title_tokens(title: str) -> frozenset:
+    return frozenset(_stem(w) for w in _words(title) if w not in TITLE_STOPWORDS and not w.isdigit())
+
+
+def company_tokens(company: str) -> frozenset:
+    return frozenset(w for w in _words(company) if w not in COMPANY_SUFFIXES)
+
+
+def location_tokens(location: str) -> frozenset:
+    return frozenset(w for w in _words(location) if w not in LOCATION_STOPWORDS)
+
+
+def minhash(title: str, company: str) -> array:
+    """MinHash signature of the character shingles of the normalized title and company."""
+    text = f"{' '.join(_words(title))} | {' '.join(sorted(company_tokens(company)))}"
+    shingles = {text[i:i + SHINGLE] for i in range(max(len(text) - SHINGLE + 1, 1))}
+    rows = [struct.unpack('<64I', b''.join(hashlib.blake2b(s.encode(), digest_size=64, key=key).digest()
+                                           for key in _HASH_KEYS))
+            for s in shingles]
+    return array('I', map(min, zip(*rows)))
+
+
+def encode_signature(signature: array) -> str:
+    return base64.b64encode(signature.tobytes()).decode('ascii')
+
+
+def decode_signature(encoded: str) -> array:
+    signature = array('I')
+    signature.frombytes(base64.b64decode(encoded))
+    return signature
+
+
+def _similarity(a, b):
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _same_place(a, b):
+    # "Berlin" and "Berlin, Germany" agree, "Berlin, Germany" and "Munich, Germany" don't.
+    # A missing or remote-only location agrees with any.
+    return not a or not b or a <= b or b <= a
+
+
+class NearDuplicateIndex:
+    """
+    Finds postings that are the same internship under a different link or a slightly
+    different title/company string (e.g. the same role from LinkedIn and Remotive).
+    Each posting gets a MinHash signature of its shingled title + company; an LSH index
+    over signature bands finds candidates in time independent of the history size, and
+    candidates are confirmed by estimated similarity, by shared title and company words
+    (so "Backend Engineer Intern" and "Frontend Engineer Intern" stay apart) and by
+    location, so the same role at the same company in two cities stays two postings.
+    Duplicates are linked to the canonical key they matched.
+    """
+
+    def __init__(self, bands: int = BANDS, threshold: float = THRESHOLD,
+                 title_threshold: float = TITLE_THRESHOLD, company_threshold: float = COMPANY_THRESHOLD):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self.company_threshold = company_threshold
+        self._buckets: Dict[tuple, List[str]] = {}
+        self._entries: Dict[str, tuple] = {}
+        # duplicate key -> canonical key
+        self.links: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _band_keys(self, signature, companies):
+        # Bands are keyed per company word too. A confirmed duplicate must share company
+        # words anyway, and this keeps generic titles ("Software Engineering Intern") from
+        # piling every company into the same buckets.
+        r = self.rows
+        bands = [(band, tuple(signature[band * r:(band + 1) * r])) for band in range(self.bands)]
+        return [(word,) + band for word in companies or ('',) for band in bands]
+
+    def find(self, title: str, company: str, signature: array = None, location: str = None) -> Optional[str]:
+        """Key of the indexed posting that `title` + `company` at `location` duplicates, or None."""
+        signature = signature if signature is not None else minhash(title, company)
+        titles, companies, places = title_tokens(title), company_tokens(company), location_tokens(location)
+        best, best_score = None, self.threshold
+        with self._lock:
+            seen = set()
+            for band_key in self._band_keys(signature, companies):
+                for key in self._buckets.get(band_key, ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    other_signature, other_titles, other_companies, other_places = self._entries[key]
+                    score = _similarity(signature, other_signature)
+                    if (score >= best_score
+                            and _jaccard(titles, other_titles) >= self.title_threshold
+                            and _jaccard(companies, other_companies) >= self.company_threshold
+                            and _same_place(places, other_places)):
+                        best, best_score = key, score
+        return self.links.get(best, best)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries or key in self.links
+
+    def add(self, key: str, title: str, company: str, signature: array = None, canonical: str = None,
+            location: str = None):
+        """Indexes a posting; with `canonical`, records it as a duplicate of that key."""
+        with self._lock:
+            if canonical is not None:
+                self.links[key] = canonical
+                return
+            if key in self._entries:
+                return
+            signature = signature if signature is not None else minhash(title, company)
+            companies = company_tokens(company)
+            self._entries[key] = (signature, title_tokens(title), companies, location_tokens(location))
+            for band_key in self._band_keys(signature, companies):
+                self._buckets.setdefault(band_key, []).append(key)
+
+
+class NearDuplicateStore(NearDuplicateIndex):
+    """
+    NearDuplicateIndex persisted on its own as an append-only JSON-lines file of
+    signatures and links, for callers without an event store (main.py's database path).
+    A new posting is matched against from the moment it is checked, but only written
+    to the file once confirm() says it was stored, so a failed insert is retried next run.
+    """
+
+    def __init__(self, path: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path or os.path.join(os.getcwd(), NEAR_DUPLICATES_FILE)
+        self._unsaved = []
+        # key -> entry of a new posting awaiting confirm()
+        self._held: Dict[str, dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.add(entry['key'], entry.get('title', ''), entry.get('company', ''),
+                             decode_signature(entry['minhash']), canonical=entry.get('canonical'),
+                             location=entry.get('location'))
+
+    def check(self, key: str, title: str, company: str, signature: array = None, location: str = None) -> Optional[str]:
+        """
+        Returns the canonical key if this posting is a near-duplicate (or `key` itself if it
+        was checked before), indexing it either way. Links to a duplicate are kept for save()
+        at once; a new posting only after confirm().
+        """
+        if key in self:
+            # Seen before under this very key: an exact repeat, not a new duplicate
+            return self.links.get(key, key)
+        signature = signature if signature is not None else minhash(title, company)
+        canonical = self.find(title, company, signature, location)
+        self.add(key, title, company, signature, canonical, location)
+        entry = {'key': key, 'title': title, 'company': company, 'location': location,
+                 'minhash': encode_signature(signature), 'canonical': canonical}
+        if canonical is None:
+            self._held[key] = entry
+        else:
+            self._unsaved.append(entry)
+        return canonical
+
+    def confirm(self, keys: Iterable[str]):
+        """Marks the new postings under `keys` as stored, so save() writes them."""
+        for key in keys:
+            entry = self._held.pop(key, None)
+            if entry is not None:
+                self._unsaved.append(entry)
+
+    def save(self):
+        if not self._unsaved:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in self._unsaved:
+                f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsaved = []
@@ -0,0 +1,92 @@
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    from http_client import HttpClient, get_default_client
+except ImportError:
+    from src.http_client import HttpClient, get_default_client
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean "slow down" rather than "broken"
+BACKOFF_STATUSES = (429, 503)
+# Default pace per host; replays of recorded pages set CRAWL_REQUESTS_PER_SECOND=inf
+REQUESTS_PER_SECOND = float(os.getenv('CRAWL_REQUESTS_PER_SECOND', '1'))
+
+
+class _HostState:
+    def __init__(self, max_concurrent, interval):
+        self.semaphore = threading.Semaphore(max_concurrent)
+        self.lock = threading.Lock()
+        self.interval = interval
+        self.next_allowed = 0.0
+
+
+class HostScheduler:
+    """
+    Per-host politeness layer over an HttpClient.
+    Caps concurrent connections and requests per second for each host, and on a
+    429/503 backs off (honouring Retry-After) and slows that host down; the rate
+    recovers gradually once the host answers normally again.
+    """
+
+    def __init__(self, client: HttpClient = None, max_concurrent: int = 2, requests_per_second: float = REQUESTS_PER_SECOND,
+                 max_retries: int = 3, max_backoff: float = 60):
+        self.client = client or get_default_client()
+        self.max_concurrent = max_concurrent
+        self.base_interval = 1.0 / requests_per_second
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostState(self.max_concurrent, self.base_interval)
+            return self._hosts[host]
+
+    def _wait_turn(self, state, deadline):
+        with state.lock:
+            now = time.monotonic()
+            slot = max(now, state.next_allowed)
+            if deadline is not None and slot > deadline:
+                raise TimeoutError("host schedule would pass the crawl deadline")
+            state.next_allowed = slot + state.interval
+        time.sleep(slot - now)
+
+    def get(self, url: str, deadline: float = None, **kwargs) -> requests.Response:
+        """
+        GET `url` within the host's limits. `deadline` is a time.monotonic() value;
+        requests that could only start after it raise TimeoutError instead of waiting.
+        """
+        state = self._host(url)
+        response = None
+        for attempt in range(self.max_retries + 1):
+            with state.semaphore:
+                self._wait_turn(state, deadline)
+                response = self.client.get(url, **kwargs)
+
+            if response.status_code not in BACKOFF_STATUSES:
+                with state.lock:
+                    state.interval = max(self.base_interval, state.interval * 0.75)
+                return response
+
+            delay = self._retry_after(response) or min(self.base_interval * 2 ** (attempt + 1), self.max_backoff)
+            logger.warning(f"{urlsplit(url).netloc} returned {response.status_code}. Backing off {delay:.1f}s.")
+            with state.lock:
+                state.interval = min(state.interval * 2, self.max_backoff)
+                state.next_allowed = max(state.next_allowed, time.monotonic() + delay)
+        return response
+
+    def _retry_after(self, response):
+        value = response.headers.get('Retry-After', '')
+        if value.isdigit():
+            return min(float(value), self.max_backoff)
+        return None
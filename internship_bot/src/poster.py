@@ -1,17 +1,33 @@
 import os
 import logging
+import re
 import time
-import requests
 from dotenv import load_dotenv
+from src.http_client import HttpClient, get_default_client
+from src.logos import LogoResolver
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Telegram's limit for photo captions; longer posts go out as text
+MAX_CAPTION = 1024
+# How Telegram words a 400 caused by the photo itself (e.g. "wrong file identifier/HTTP URL
+# specified", "failed to get HTTP URL content", "IMAGE_PROCESS_FAILED", "PHOTO_INVALID_DIMENSIONS")
+_PHOTO_ERROR = re.compile(r'photo|image|file|url|web page content', re.IGNORECASE)
+
 class Poster:
-    def __init__(self, bot_token, channel_id):
+    def __init__(self, bot_token, channel_id, client: HttpClient = None, logos: LogoResolver = None):
+        self.client = client or get_default_client()
         self.bot_token = bot_token
         self.channel_id = channel_id
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}/sendPhoto"
+        self.text_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        # Decides photo vs. text before posting, so a post is a single API call
+        self.logos = logos or LogoResolver(client=self.client)
+
+    def prefetch_logos(self, internships):
+        """Checks the logos of the posts about to be sent, concurrently."""
+        self.logos.prefetch(internships)
 
     def format_message(self, internship):
         return (
@@ -39,31 +55,42 @@ class Poster:
             return False
 
         message = self.format_message(internship)
-        logo_url = internship.get('logo')
+        logo_url = self.logos.logo_for(internship) if len(message) <= MAX_CAPTION else None
 
-        payload = {
-            'chat_id': self.channel_id,
-            'caption': message,
-            'parse_mode': 'HTML',
-            'photo': logo_url
-        }
+        if logo_url:
+            response = self._send(self.api_url, {'chat_id': self.channel_id, 'caption': message,
+                                                 'parse_mode': 'HTML', 'photo': logo_url})
+            if response is not None and response.ok:
+                logger.info(f"Posted: {internship['title']}")
+                return True
+            if response is None or response.status_code == 429 or response.status_code >= 500:
+                # Unreachable, rate limited or down: nothing wrong with the post, so leave it for the next run
+                return False
+            if response.status_code == 400 and _PHOTO_ERROR.search(self._description(response)):
+                # Passed the logo check but Telegram still refused it: don't try it again
+                self.logos.mark_bad(internship)
+            logger.warning("Failed to post with image. Retrying with text only...")
 
-        try:
-            # First try sending with photo
-            response = requests.post(self.api_url, data=payload)
-            response.raise_for_status()
-            logger.info(f"Posted: {internship['title']}")
+        response = self._send(self.text_url, {'chat_id': self.channel_id, 'text': message, 'parse_mode': 'HTML'})
+        if response is not None and response.ok:
+            logger.info(f"Posted (Text Only): {internship['title']}")
             return True
+        return False
+
+    def _send(self, url, payload):
+        """The Telegram API's response, or None if it could not be reached."""
+        try:
+            response = self.client.post(url, json=payload)
         except Exception as e:
-            logger.warning(f"Failed to post with image: {e}. Retrying with text only...")
-            # Fallback to text message if image fails (e.g. invalid URL)
-            text_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload.pop('photo')
-            payload['text'] = message
-            try:
-                requests.post(text_url, json=payload).raise_for_status()
-                logger.info(f"Posted (Text Only): {internship['title']}")
-                return True
-            except Exception as ex:
-                logger.error(f"Failed to post text fallback: {ex}")
-                return False
+            logger.error(f"Telegram request failed: {e}")
+            return None
+        if not response.ok:
+            logger.error(f"Telegram request failed: {response.status_code} {self._description(response)}")
+        return response
+
+    @staticmethod
+    def _description(response):
+        try:
+            return response.json().get('description', '')
+        except ValueError:
+            return ''
@@ -1,176 +1,299 @@
-import json
-import os
 import hashlib
+import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
-DATA_FILE = "data/internships.json"
+try:
+    from dedupe import DedupeIndex
+    from event_store import EventStore
+    from gazetteer import resolve_country, SHORT_NAMES
+    from classifier import classify, classify_many
+    from near_duplicates import NearDuplicateIndex, minhash, encode_signature, decode_signature
+    from dedupe import canonical_link
+    from backfill import map_chunks, CHUNK_SIZE
+except ImportError:
+    from src.dedupe import DedupeIndex
+    from src.event_store import EventStore
+    from src.gazetteer import resolve_country, SHORT_NAMES
+    from src.classifier import classify, classify_many
+    from src.near_duplicates import NearDuplicateIndex, minhash, encode_signature, decode_signature
+    from src.dedupe import canonical_link
+    from src.backfill import map_chunks, CHUNK_SIZE
 
-class Processor:
-    def __init__(self):
-        self.data_file = os.path.join(os.getcwd(), DATA_FILE)
-        self.ensure_data_file()
+# Target Regions (Strict Filter)
+# Note: 'Remote' is kept as it often applies to these regions.
+ALLOWED_COUNTRIES = {
+    'USA', 'Canada', 'Australia', 'New Zealand', 
+    'UK', 'Germany', 'France', 'Switzerland', 'Netherlands', 'Spain', 
+    'Italy', 'Sweden', 'Ireland', 'Austria', 'Belgium', 'Portugal', 
+    'Poland', 'Denmark', 'Norway', 'Finland', 'Remote'
+}
+# The Processor's field names for each taxonomy field; anything unclassified is "STEM"
+FIELD_LABELS = {
+    "Computer Science": "Computer Science / Engineering",
+    "Engineering": "Computer Science / Engineering",
+    "Data Science & AI": "Data Science / AI",
+    "Bio & Science": "Research / Science",
+    "Mathematics": "Research / Science",
+}
+# New items appended between fsyncs of the event log while streaming
+CHECKPOINT_EVERY = 25
+# ...and while backfilling, where the snapshot is only rewritten once at the end
+BACKFILL_CHECKPOINT_EVERY = 10_000
 
-    def ensure_data_file(self):
-        if not os.path.exists(self.data_file):
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            with open(self.data_file, 'w') as f:
-                json.dump([], f)
+logger = logging.getLogger(__name__)
 
-    def load_data(self):
-        try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+def generate_id(internship):
+    """Generates a unique hash based on title, company, and location."""
+    raw_string = f"{internship['title']}{internship['company']}{internship['location']}".lower().replace(" ", "")
+    return hashlib.md5(raw_string.encode()).hexdigest()
 
-    def save_data(self, data):
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=2)
+def field_label(category):
+    """The Processor's field name for a classifier result."""
+    return FIELD_LABELS.get(category, "STEM")
 
-    def generate_id(self, internship):
-        """Generates a unique hash based on title, company, and location."""
-        raw_string = f"{internship['title']}{internship['company']}{internship['location']}".lower().replace(" ", "")
-        return hashlib.md5(raw_string.encode()).hexdigest()
+def normalize_internship(raw_data, field=None):
+    """
+    Converts raw scraper output to strict schema.
+    Expected keys in raw_data: title, company, location, link, source, etc.
+    `field` is the item's field name when the caller has already classified it.
+    """
+    # Field Classification (shared taxonomy, scored over title and tags, cached per title)
+    if field is None:
+        field = field_label(classify(raw_data.get('title', ''), raw_data.get('tags')))
+
+    # Country Extraction (shared gazetteer, compiled once and cached per location)
+    location = raw_data.get('location', 'Remote')
+    code = resolve_country(location)
+    country = SHORT_NAMES[code] if code else "Remote"
+
+    # Domain for Logo
+    company_domain = raw_data.get('company', '').lower().replace(" ", "") + ".com" # Very naive, but functional fo clearbit often
 
-    def normalize_internship(self, raw_data):
+    return {
+        "id": generate_id(raw_data),
+        "title": raw_data.get('title', 'Internship'),
+        "company": raw_data.get('company', 'Unknown'),
+        "location": location,
+        "country": country,
+        "field": field,
+        "duration": raw_data.get('duration', 'Not specified'),
+        "stipend": raw_data.get('stipend', 'Not specified'),
+        "requirements": raw_data.get('tags', []),
+        "apply_link": raw_data.get('link'),
+        "source": raw_data.get('source', 'Web'),
+        "logo": f"https://logo.clearbit.com/{company_domain}",
+        "deadline": raw_data.get('deadline', 'Open'),
+        "posted_at": datetime.now().isoformat(),
+        "posted_to_telegram": False
+    }
+
+def is_wanted(normalized):
+    # STRICT FILTER: Discard if not in target regions
+    if normalized['country'] not in ALLOWED_COUNTRIES:
+        return False
+    # Extra Safety: Explicitly exclude India if it somehow slipped through as 'Remote' but location says India
+    if "india" in normalized['location'].lower():
+        return False
+    return True
+
+def prepare_chunk(raw_items):
+    """
+    Backfill worker task: normalizes and filters a chunk of raw items and computes their
+    canonical links and MinHash signatures, so the parent only deduplicates and stores.
+    """
+    prepared = []
+    for raw in raw_items:
+        item = normalize_internship(raw)
+        if not is_wanted(item):
+            continue
+        item['link_key'] = canonical_link(item['apply_link'])
+        item['minhash'] = encode_signature(minhash(item['title'], item['company']))
+        prepared.append(item)
+    return prepared
+
+class Processor:
+    def __init__(self, store: EventStore = None):
+        # Snapshot + append-only event log; migrates data/internships.json on first use.
+        # Loaded once here; every later read uses the in-memory view.
+        self.store = store or EventStore()
+        self._index = None
+        self._near = None
+        # Set while a session() is open: writes are held until it commits
+        self._session = None
+        self._dirty = set()
+
+    @contextmanager
+    def session(self, checkpoint_every: int = None):
         """
-        Converts raw scraper output to strict schema.
-        Expected keys in raw_data: title, company, location, link, source, etc.
+        Unit of work over the store. Inside the block, process_stream and mark_as_posted
+        only record their changes; the changed records are committed in one durable write
+        when the block exits (also on error, so finished work is kept), or whenever
+        `checkpoint_every` records are dirty.
         """
-        # Field Classification (Simple Keyword Matching)
-        title_lower = raw_data.get('title', '').lower()
-        field = "STEM"
-        if any(x in title_lower for x in ['data', 'ai', 'learning', 'analyst']):
-            field = "Data Science / AI"
-        elif any(x in title_lower for x in ['software', 'developer', 'engineer', 'web', 'backend', 'frontend']):
-            field = "Computer Science / Engineering"
-        elif any(x in title_lower for x in ['research', 'science', 'bio', 'chem']):
-            field = "Research / Science"
-        
-        # Country Extraction
-        location = raw_data.get('location', 'Remote')
-        country = "Remote" 
-        
-        # Normalize location string for search
-        loc_lower = location.lower()
-        
-        # Mapping for Target Countries (EU, US, CA, AU)
-        # Priority: Exact code match or full name match
-        country_map = {
-            'united states': 'USA', 'usa': 'USA', 'us': 'USA',
-            'united kingdom': 'UK', 'uk': 'UK', 'great britain': 'UK', 'gb': 'UK', 'london': 'UK',
-            'canada': 'Canada', 'ca': 'Canada',
-            'australia': 'Australia', 'au': 'Australia',
-            'germany': 'Germany', 'de': 'Germany', 'berlin': 'Germany', 'munich': 'Germany',
-            'france': 'France', 'fr': 'France', 'paris': 'France',
-            'switzerland': 'Switzerland', 'ch': 'Switzerland', 'geneva': 'Switzerland', 'zurich': 'Switzerland',
-            'netherlands': 'Netherlands', 'nl': 'Netherlands', 'amsterdam': 'Netherlands',
-            'spain': 'Spain', 'es': 'Spain', 'madrid': 'Spain', 'barcelona': 'Spain',
-            'italy': 'Italy', 'it': 'Italy',
-            'sweden': 'Sweden', 'se': 'Sweden',
-            'ireland': 'Ireland', 'ie': 'Ireland', 'dublin': 'Ireland',
-            'austria': 'Austria', 'at': 'Austria',
-            'belgium': 'Belgium', 'be': 'Belgium',
-            'portugal': 'Portugal', 'pt': 'Portugal',
-            'poland': 'Poland', 'pl': 'Poland',
-            'denmark': 'Denmark', 'dk': 'Denmark',
-            'norway': 'Norway', 'no': 'Norway',
-            'finland': 'Finland', 'fi': 'Finland',
-            'india': 'India', 'in': 'India'
-        }
-        
-        # Check against map
-        # 1. Check for whole words to avoid partial matches (e.g. 'us' in 'industry')
-        import re
-        found = False
-        for key, val in country_map.items():
-            # Regex for "\bkey\b"
-            if re.search(r'\b' + re.escape(key) + r'\b', loc_lower):
-                country = val
-                found = True
-                break
-        
-        # Fallback if no specific country found but location isn't empty
-        if not found and location and location.lower() != "remote":
-             # Use the location text itself if it looks like a country (simple heuristic)
-             pass
-
-        # Domain for Logo
-        company_domain = raw_data.get('company', '').lower().replace(" ", "") + ".com" # Very naive, but functional fo clearbit often
-
-        return {
-            "id": self.generate_id(raw_data),
-            "title": raw_data.get('title', 'Internship'),
-            "company": raw_data.get('company', 'Unknown'),
-            "location": location,
-            "country": country,
-            "field": field,
-            "duration": raw_data.get('duration', 'Not specified'),
-            "stipend": raw_data.get('stipend', 'Not specified'),
-            "requirements": raw_data.get('tags', []),
-            "apply_link": raw_data.get('link'),
-            "source": raw_data.get('source', 'Web'),
-            "logo": f"https://logo.clearbit.com/{company_domain}",
-            "deadline": raw_data.get('deadline', 'Open'),
-            "posted_at": datetime.now().isoformat(),
-            "posted_to_telegram": False
-        }
+        self._session = {'checkpoint_every': checkpoint_every}
+        try:
+            yield self
+        finally:
+            self._session = None
+            self.commit()
+
+    def commit(self):
+        """Makes every dirty record durable. Only the changes are written (as appended events)."""
+        if not self._dirty and not self.store.unsynced:
+            return
+        self.store.sync()
+        logger.info(f"Committed {len(self._dirty)} changed internships.")
+        self._dirty.clear()
+
+    def _checkpoint(self):
+        if self._session is None:
+            self.commit()
+        elif self._session['checkpoint_every'] and len(self._dirty) >= self._session['checkpoint_every']:
+            self.commit()
+
+    def load_data(self):
+        """All stored internships, in insertion order."""
+        return list(self.store.items)
+
+    def generate_id(self, internship):
+        return generate_id(internship)
+
+    def normalize_internship(self, raw_data, field=None):
+        return normalize_internship(raw_data, field)
 
     def process_batch(self, new_internships):
         """
         Takes a list of raw dictionaries, normalizes them, and merges with existing data.
         Returns the number of new items added.
         """
-        current_data = self.load_data()
-        current_ids = {item['id'] for item in current_data}
-        
-        # Target Regions (Strict Filter)
-        # Note: 'Remote' is kept as it often applies to these regions.
-        ALLOWED_COUNTRIES = {
-            'USA', 'Canada', 'Australia', 'New Zealand', 
-            'UK', 'Germany', 'France', 'Switzerland', 'Netherlands', 'Spain', 
-            'Italy', 'Sweden', 'Ireland', 'Austria', 'Belgium', 'Portugal', 
-            'Poland', 'Denmark', 'Norway', 'Finland', 'Remote'
-        }
+        new_internships = list(new_internships)
+        # Classify the whole batch in one call; each distinct (title, tags) is scored once
+        categories = classify_many([i.get('title', '') for i in new_internships],
+                                   [i.get('tags') for i in new_internships])
+        return self._process(zip(new_internships, map(field_label, categories)), CHECKPOINT_EVERY)
+
+    def process_stream(self, raw_items, checkpoint_every=CHECKPOINT_EVERY):
+        """
+        Normalizes, deduplicates and stores raw items as they arrive from any iterable
+        (e.g. ContentScraper.stream_all). Each new item is one appended event; the log is
+        fsynced every `checkpoint_every` new items and once more at the end, even if the
+        stream raises part-way, so items already processed are never lost.
+        Inside a session() the writes are left to the session's commit instead.
+        Returns the number of new items added.
+        """
+        return self._process(((raw, None) for raw in raw_items), checkpoint_every)
+
+    def _process(self, classified, checkpoint_every):
+        """process_stream over (raw item, field name or None to classify it here) pairs."""
+        self._ensure_indexes()
         
         added_count = 0
+        unsaved = 0
         
-        for raw in new_internships:
-            normalized = self.normalize_internship(raw)
-            
-            # STRICT FILTER: Discard if not in target regions
-            if normalized['country'] not in ALLOWED_COUNTRIES:
-                # Log explicitly if needed, but for now just skip
-                continue
-                
-            # Extra Safety: Explicitly exclude India if it somehow slipped through as 'Remote' but location says India
-            if "india" in normalized['location'].lower():
-                continue
-
-            # Deduplication
-            if normalized['id'] not in current_ids:
-                # Also check Apply Link uniqueness to be safe
-                if not any(x['apply_link'] == normalized['apply_link'] for x in current_data):
-                    current_data.append(normalized)
-                    current_ids.add(normalized['id'])
-                    added_count += 1
-        
-        self.save_data(current_data)
+        try:
+            for raw, field in classified:
+                unsaved += self._merge(raw, self._index, field)
+                if unsaved >= checkpoint_every:
+                    self._checkpoint()
+                    added_count += unsaved
+                    unsaved = 0
+        finally:
+            added_count += unsaved
+            if self._session is None:
+                self.commit()
+        return added_count
+
+    def backfill(self, raw_items, workers=None, chunk_size=CHUNK_SIZE, checkpoint_every=BACKFILL_CHECKPOINT_EVERY):
+        """
+        process_stream for large re-imports (historical dumps, replayed archives).
+        Normalization, filtering and MinHash signatures run on a pool of `workers`
+        processes (default: one per core), `chunk_size` raw items per task; results come
+        back in input order and are deduplicated and appended to the store as they arrive.
+        The log is fsynced every `checkpoint_every` new items and the snapshot rewritten
+        once at the end (also if the input fails part-way) rather than every COMPACT_EVERY events.
+        Returns the number of new items added.
+        """
+        self._ensure_indexes()
+        added_count = 0
+        unsaved = 0
+        try:
+            for item in map_chunks(prepare_chunk, raw_items, workers, chunk_size):
+                unsaved += self._add(item, self._index, decode_signature(item['minhash']))
+                if unsaved >= checkpoint_every:
+                    self.store.sync(compact=False)
+                    added_count += unsaved
+                    unsaved = 0
+        finally:
+            added_count += unsaved
+            self.store.compact()
+            self._dirty.clear()
+        logger.info(f"Backfill added {added_count} new internships.")
         return added_count
 
+    def _ensure_indexes(self):
+        if self._index is None:
+            # Built once per Processor; lookups stay O(1) however many items are stored
+            self._index = DedupeIndex(self.store.items)
+        if self._near is None:
+            self._near = self._build_near_duplicates()
+
+    def _build_near_duplicates(self):
+        """LSH index over every stored item. Signatures are kept on the items, so they persist with the store."""
+        near = NearDuplicateIndex()
+        for item in self.store.items:
+            if item.get('minhash'):
+                signature = decode_signature(item['minhash'])
+            else:
+                # Items stored before near-duplicate detection; saved with the next snapshot
+                signature = minhash(item['title'], item['company'])
+                item['minhash'] = encode_signature(signature)
+            near.add(item['id'], item['title'], item['company'], signature, location=item.get('location'))
+        return near
+
+    def _merge(self, raw, index, field=None):
+        """Normalizes one raw item and appends it if it passes the filters. Returns 1 if added."""
+        normalized = self.normalize_internship(raw, field)
+        if not is_wanted(normalized):
+            return 0
+        return self._add(normalized, index)
+
+    def _add(self, normalized, index, signature=None):
+        """Appends a normalized item unless it is a duplicate. Returns 1 if added."""
+        # Deduplication by id hash, and by canonical apply link to be safe
+        if index.contains(normalized):
+            return 0
+
+        # Near-duplicates (the same role under another link, or a reworded title/company
+        # from another source) are linked to the stored item instead of being stored and posted again
+        if signature is None:
+            signature = minhash(normalized['title'], normalized['company'])
+        canonical = self._near.find(normalized['title'], normalized['company'], signature, normalized['location'])
+        if canonical is not None:
+            index.add(normalized)
+            duplicate = {key: normalized[key] for key in ('id', 'title', 'company', 'apply_link', 'link_key', 'source')}
+            if self.store.link_duplicate(canonical, duplicate, sync=False):
+                self._dirty.add(canonical)
+            return 0
+
+        normalized['minhash'] = encode_signature(signature)
+        self._near.add(normalized['id'], normalized['title'], normalized['company'], signature,
+                       location=normalized['location'])
+        index.add(normalized)
+        self.store.insert(normalized, sync=False)
+        self._dirty.add(normalized['id'])
+        return 1
+
     def get_pending_posts(self, limit=5):
         """Returns internships that haven't been posted yet."""
-        data = self.load_data()
-        pending = [item for item in data if not item.get('posted_to_telegram')]
+        pending = [item for item in self.store.items if not item.get('posted_to_telegram')]
         # Sort by posted_at desc (newest first)? Or oldest first to catch up?
         # Usually newest first is better for a news feed.
         pending.sort(key=lambda x: x['posted_at'], reverse=True)
         return pending[:limit]
 
     def mark_as_posted(self, internship_id):
-        data = self.load_data()
-        for item in data:
-            if item['id'] == internship_id:
-                item['posted_to_telegram'] = True
-                break
-        self.save_data(data)
+        # One appended event instead of a rewrite of the whole dataset
+        if self.store.mark_posted(internship_id, sync=False):
+            self._dirty.add(internship_id)
+            self._checkpoint()
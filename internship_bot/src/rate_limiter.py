@@ -0,0 +1,84 @@
+import logging
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Requests a user may make in any 24 hours
+DAILY_LIMIT = 100
+# Seconds between write-behind flushes of changed counters
+FLUSH_INTERVAL = 5.0
+_DAY = 24 * 3600
+
+
+class RateLimiter:
+    """
+    Per-user request limits served from memory, with write-behind persistence.
+    Counts are kept per user and calendar day, the shape of the user_requests table, and
+    the limit applies to a sliding 24-hour window estimated from them: yesterday's count,
+    weighted by the share of the window it still covers, plus today's.
+    A request only touches memory. Changed counters are written to the database in one
+    batched upsert every `flush_interval` seconds by a background thread, and once more on
+    close(); on start, yesterday's and today's rows are loaded back, so counts survive a restart.
+    """
+
+    def __init__(self, db, limit: int = DAILY_LIMIT, flush_interval: float = FLUSH_INTERVAL):
+        self.db = db
+        self.limit = limit
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        # (user_id, 'YYYY-MM-DD') -> requests that day
+        self._counts: Dict[Tuple[int, str], int] = db.load_request_counts(self._day(datetime.now() - timedelta(days=1)))
+        self._dirty = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rate-limit-flush', daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _day(moment):
+        return moment.strftime('%Y-%m-%d')
+
+    def check(self, user_id: int) -> Tuple[bool, int]:
+        """
+        Counts a request from `user_id` if it is within the limit.
+        Returns (allowed, requests in the last 24 hours including this one).
+        """
+        now = datetime.now()
+        today, yesterday = self._day(now), self._day(now - timedelta(days=1))
+        elapsed = (now - now.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
+        with self._lock:
+            current = self._counts.get((user_id, today), 0)
+            recent = self._counts.get((user_id, yesterday), 0) * (1 - elapsed / _DAY) + current
+            if recent >= self.limit:
+                return False, min(math.ceil(recent), self.limit)
+            self._counts[(user_id, today)] = current + 1
+            self._dirty.add((user_id, today))
+            return True, math.ceil(recent) + 1
+
+    def flush(self):
+        """Writes every changed counter in one transaction and forgets days that no longer count."""
+        with self._lock:
+            changed = {key: self._counts[key] for key in self._dirty}
+            self._dirty.clear()
+            oldest = self._day(datetime.now() - timedelta(days=1))
+            for key in [key for key in self._counts if key[1] < oldest]:
+                del self._counts[key]
+        if not changed:
+            return
+        try:
+            self.db.save_request_counts(changed)
+        except Exception as e:
+            logger.error(f"Failed to save request counts, retrying next flush: {e}")
+            with self._lock:
+                self._dirty.update(key for key in changed if key in self._counts)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
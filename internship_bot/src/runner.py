@@ -0,0 +1,200 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+try:
+    from health import SourceHealth
+except ImportError:
+    from src.health import SourceHealth
+
+logger = logging.getLogger(__name__)
+
+# Seconds a single source may take before it is dropped from the run
+DEFAULT_SOURCE_TIMEOUT = 30
+# Seconds the whole scrape phase may take, regardless of per-source deadlines
+DEFAULT_RUN_TIMEOUT = 60
+# Items buffered between the source threads and the consumer
+QUEUE_SIZE = 256
+
+_ITEM, _DONE, _FAILED = 'item', 'done', 'failed'
+
+
+def _events(sources, source_timeout, run_timeout, timeouts, health, queue_size):
+    """
+    Runs every source in its own thread and yields (name, kind, payload) events:
+    'item' for each record as it is produced, then 'done' or 'failed' per source.
+    A deadline counts only the time a source spends producing: its clock stops once
+    the source returns, and time blocked on a full queue (waiting for the consumer)
+    is added back. A source still producing at its deadline is cut off; the items it
+    queued before that are still yielded, then 'failed' with a TimeoutError.
+    """
+    if health is not None:
+        skipped = [name for name, _ in sources if not health.allow(name)]
+        for name in skipped:
+            logger.info(f"Source {name}: circuit open, skipping.")
+        sources = [(name, func) for name, func in sources if name not in skipped]
+
+    if not sources:
+        return
+
+    timeouts = timeouts or {}
+    start = time.monotonic()
+    run_deadline = start + run_timeout
+    deadlines = {name: min(start + timeouts.get(name, source_timeout), run_deadline) for name, _ in sources}
+    events = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    # Shared with the source threads, under `lock`: items each source queued, seconds it
+    # spent waiting to queue them (and since when, while it waits), sources that
+    # returned and sources that were cut off
+    lock = threading.Lock()
+    sent = {name: 0 for name in deadlines}
+    blocked = {name: 0.0 for name in deadlines}
+    blocked_since = {}
+    returned, cut = set(), set()
+
+    def put(name, event):
+        with lock:
+            if name in cut:
+                return False
+            # Counted before it is queued, so a cut-off source is drained up to this item
+            if event[1] == _ITEM:
+                sent[name] += 1
+            blocked_since[name] = time.monotonic()
+        try:
+            # Never block forever: the consumer may have stopped listening
+            while not stop.is_set():
+                try:
+                    events.put(event, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            with lock:
+                blocked[name] += time.monotonic() - blocked_since.pop(name)
+
+    def waited(name, now):
+        """Seconds `name` has spent waiting on the consumer so far (call under `lock`)."""
+        return blocked[name] + (now - blocked_since[name] if name in blocked_since else 0.0)
+
+    def finish(name, event):
+        with lock:
+            if name in cut:
+                return
+            returned.add(name)
+        put(name, event)
+
+    def produce(name, func):
+        try:
+            for item in func() or []:
+                if not put(name, (name, _ITEM, item)):
+                    return
+        except Exception as e:
+            finish(name, (name, _FAILED, e))
+        else:
+            finish(name, (name, _DONE, None))
+
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="source")
+    for name, func in sources:
+        executor.submit(produce, name, func)
+
+    active = set(deadlines)
+    # Sources cut off at their deadline whose queued items are still being delivered
+    draining = set()
+    counts = {name: 0 for name in deadlines}
+    completed = 0
+
+    try:
+        while active or draining:
+            with lock:
+                now = time.monotonic()
+                pending = {name: deadlines[name] + waited(name, now) for name in active if name not in returned}
+            timeout = max(0, min(pending.values()) - time.monotonic()) if pending else None
+            try:
+                name, kind, payload = events.get(timeout=timeout)
+            except queue.Empty:
+                name, kind, payload = None, None, None
+
+            if name in active or name in draining:
+                if kind == _ITEM:
+                    counts[name] += 1
+                    yield name, _ITEM, payload
+                elif kind == _DONE:
+                    active.discard(name)
+                    completed += 1
+                    if health is not None:
+                        health.record_success(name)
+                    logger.info(f"{name}: Found {counts[name]} items in {time.monotonic() - start:.1f}s")
+                    yield name, _DONE, None
+                else:
+                    active.discard(name)
+                    logger.error(f"Source {name} failed: {payload}")
+                    if health is not None:
+                        health.record_failure(name)
+                    yield name, _FAILED, payload
+
+            now = time.monotonic()
+            with lock:
+                for name in [n for n in active if n not in returned and now >= deadlines[n] + waited(n, now)]:
+                    cut.add(name)
+                    active.discard(name)
+                    draining.add(name)
+                drained = [n for n in draining if counts[n] >= sent[n]]
+            for name in drained:
+                draining.discard(name)
+                logger.warning(f"Source {name} missed its {deadlines[name] - start:.0f}s deadline. "
+                               f"Keeping {counts[name]} items it produced in time.")
+                if health is not None:
+                    health.record_failure(name)
+                yield name, _FAILED, TimeoutError(f"{name} missed its deadline")
+    finally:
+        # Late sources keep running in their threads; we just stop waiting for them.
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if health is not None:
+            health.save()
+        logger.info(f"Ran {len(sources)} sources in {time.monotonic() - start:.1f}s "
+                    f"({completed} completed).")
+
+
+def stream_sources(sources: List[Tuple[str, Callable[[], Iterable[Dict]]]],
+                   source_timeout: float = DEFAULT_SOURCE_TIMEOUT,
+                   run_timeout: float = DEFAULT_RUN_TIMEOUT,
+                   timeouts: Dict[str, float] = None, health: SourceHealth = None,
+                   queue_size: int = QUEUE_SIZE) -> Iterator[Tuple[str, Dict]]:
+    """
+    Runs every (name, callable) source in parallel and yields (name, item) pairs as
+    soon as any source produces them, through a bounded queue so fast sources cannot
+    run far ahead of the consumer. Sources may return lists or generators.
+    Items from a source that later fails or misses its deadline are still yielded,
+    so work done before a crash is never thrown away.
+    """
+    for name, kind, payload in _events(sources, source_timeout, run_timeout, timeouts, health, queue_size):
+        if kind == _ITEM:
+            yield name, payload
+
+
+def run_sources(sources: List[Tuple[str, Callable[[], List[Dict]]]],
+                source_timeout: float = DEFAULT_SOURCE_TIMEOUT,
+                run_timeout: float = DEFAULT_RUN_TIMEOUT,
+                timeouts: Dict[str, float] = None, health: SourceHealth = None) -> List[Tuple[str, List[Dict]]]:
+    """
+    Runs every (name, callable) source in parallel and returns (name, results) pairs,
+    in the order the sources were given, for those that finished in time.
+    A source that raises or misses its deadline is logged and left out, so the
+    caller always gets partial results instead of waiting on the slowest host.
+    `timeouts` overrides `source_timeout` for individual source names.
+    With `health`, sources whose circuit is open are skipped, and every outcome
+    (including a missed deadline) is recorded and persisted.
+    """
+    collected = {name: [] for name, _ in sources}
+    finished = set()
+    for name, kind, payload in _events(sources, source_timeout, run_timeout, timeouts, health, QUEUE_SIZE):
+        if kind == _ITEM:
+            collected[name].append(payload)
+        elif kind == _DONE:
+            finished.add(name)
+    return [(name, collected[name]) for name, _ in sources if name in finished]
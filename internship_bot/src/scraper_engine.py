@@ -1,163 +1,174 @@
 
-import requests
-import feedparser
-from bs4 import BeautifulSoup
+import os
 import logging
 from typing import List, Dict
+from src.http_client import HttpClient, get_default_client
+from src.http_cache import HttpCache
+from src.smartrecruiters import SmartRecruitersClient
+from src.politeness import HostScheduler
+from src.internshala_crawler import InternshalaCrawler
+from src.html_parsing import extract_cards, INTERNSHALA
+from src.feeds import iter_entries
+from src.health import SourceHealth, SourceUnavailable
+from src.runner import run_sources, stream_sources, DEFAULT_SOURCE_TIMEOUT, DEFAULT_RUN_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# SmartRecruiters company ids to ingest, e.g. SMARTRECRUITERS_COMPANIES="CERN,Bosch"
+SMARTRECRUITERS_COMPANIES = [c.strip() for c in os.getenv('SMARTRECRUITERS_COMPANIES', 'CERN').split(',') if c.strip()]
+
 class ContentScraper:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+    def __init__(self, client: HttpClient = None, cache: HttpCache = None, health: SourceHealth = None):
+        # Shared pooled HTTP client (central User-Agent, keep-alive, compression)
+        self.client = client or get_default_client()
+        # Conditional-GET cache for the feeds and JSON APIs
+        self.cache = cache or HttpCache(client=self.client)
+        self.smartrecruiters = SmartRecruitersClient(client=self.client, cache=self.cache)
+        self.internshala = InternshalaCrawler(HostScheduler(client=self.client))
+        # Circuit breaker state, so dead or blocking sources are skipped
+        self.health = health or SourceHealth()
 
     def scrape_rss(self, url, source_name):
-        """Scrapes standard RSS feeds"""
+        """Scrapes standard RSS feeds, yielding entries as they are parsed"""
         logger.info(f"Scraping RSS: {url}")
-        feed = feedparser.parse(url)
-        results = []
+        # On a 304 this is the cached body
+        response = self.cache.get(url, stream=True)
+        response.raise_for_status()
         
-        for entry in feed.entries:
-            title = entry.title
-            link = entry.link
-            
-            if "intern" in title.lower():
-                results.append({
-                    "title": title,
-                    "company": getattr(entry, 'author', source_name),
+        with response.open() as stream:
+            for entry in iter_entries(stream, keywords=["intern"]):
+                yield {
+                    "title": entry['title'],
+                    "company": entry['author'] or source_name,
                     "location": "Remote", 
-                    "link": link,
+                    "link": entry['link'],
                     "source": source_name,
-                    "tags": [tag.term for tag in entry.tags] if hasattr(entry, 'tags') else [],
-                    "posted_at": getattr(entry, 'published', 'Recently')
-                })
-        return results
+                    "tags": entry['tags'],
+                    "posted_at": entry['published'] or 'Recently'
+                }
 
-    def scrape_cern_api(self):
-        """Scrapes CERN jobs via SmartRecruiters API"""
-        url = "https://api.smartrecruiters.com/v1/companies/CERN/postings"
-        logger.info(f"Scraping CERN API: {url}")
-        results = []
+    def scrape_smartrecruiters(self, company_id):
+        """Scrapes a company's new postings via the SmartRecruiters API, yielding them page by page"""
+        logger.info(f"Scraping SmartRecruiters API: {company_id}")
         try:
-            r = requests.get(url) # No headers
-            if r.status_code == 200:
-                data = r.json()
-                for job in data.get('content', []):
-                    # Filter for STEM/Intern/Student
-                    title = job['name']
-                    # CERN posts often explicitly say "Student" or "Graph" etc.
-                    # We will take all tech/student roles.
-                    # Actually, for CERN, almost everything is STEM.
-                    # Let's filter slightly for "Student", "Graduate", "Intern", "Fellow" to avoid senior stuff?
-                    # Or just take everything as they are high quality. User said "CERN Careers" (implied all).
-                    # But Processor filters for STEM fields.
-                    
-                    results.append({
-                        "title": title,
-                        "company": "CERN",
-                        "location": job['location']['city'] + ", " + job['location']['country'],
-                        "link": f"https://jobs.smartrecruiters.com/CERN/{job['id']}",
-                        "source": "CERN Careers",
-                        "tags": [],
-                        "posted_at": job['releasedDate']
-                    })
+            for job in self.smartrecruiters.iter_postings(company_id):
+                # Take every posting; Processor filters for STEM fields and regions.
+                location = job.get('location', {})
+                company = job.get('company', {}).get('name') or company_id
+                yield {
+                    "title": job['name'],
+                    "company": company,
+                    "location": f"{location.get('city', '')}, {location.get('country', '')}".strip(', '),
+                    "link": f"https://jobs.smartrecruiters.com/{company_id}/{job['id']}",
+                    "source": f"{company} Careers",
+                    "tags": [],
+                    "posted_at": job['releasedDate']
+                }
         except Exception as e:
-            logger.error(f"CERN Scraper failed: {e}")
-        return results
+            raise SourceUnavailable(f"SmartRecruiters {company_id} scraper failed: {e}") from e
+
+    def scrape_cern_api(self):
+        """Scrapes CERN jobs via SmartRecruiters API, yielding them page by page"""
+        return self.scrape_smartrecruiters("CERN")
 
     def scrape_internshala(self):
-        """Scrapes Internshala Computer Science Internships"""
-        url = "https://internshala.com/internships/computer-science-internship/"
-        logger.info(f"Scraping Internshala: {url}")
+        """Crawls the configured Internshala categories and page depths, yielding each category as it completes"""
+        logger.info(f"Scraping Internshala: {', '.join(self.internshala.categories)}")
+        try:
+            yield from self.internshala.iter_crawl(self.parse_internshala_page)
+        except Exception as e:
+            raise SourceUnavailable(f"Internshala failed: {e}") from e
+
+    def parse_internshala_page(self, content, category):
+        """Extracts internship cards from one Internshala listing page"""
         results = []
         try:
-            r = requests.get(url, headers=self.headers, timeout=15)
-            soup = BeautifulSoup(r.content, 'html.parser')
-            
-            # Internshala CSS classes change often. Using the logic from previous robust scraper.
-            internships = soup.find_all('div', class_='individual_internship') or \
-                          soup.find_all('div', id=lambda x: x and x.startswith('individual_internship_'))
-            
-            for i in internships:
-                try:
-                    title_elem = i.find('h3', class_='heading_4_5') or i.find('div', class_='heading_4_5')
-                    company_elem = i.find('h4', class_='heading_6_company') or i.find('div', class_='company_name')
-                    location_elem = i.find('a', class_='location_link') or i.find('span', class_='location_link')
-                    
-                    # Link logic
-                    link = i.get('data-href')
-                    if not link:
-                         # Fallback search
-                         title_a = i.find('a', class_='view_detail_button')
-                         if title_a: link = title_a.get('href')
-
-                    if not link: continue
-
-                    full_link = f"https://internshala.com{link}" if link.startswith('/') else link
-                    
-                    results.append({
-                        "title": title_elem.get_text(strip=True) if title_elem else "Internship",
-                        "company": company_elem.get_text(strip=True) if company_elem else "Unknown",
-                        "location": location_elem.get_text(strip=True) if location_elem else "India",
-                        "link": full_link,
-                        "source": "Internshala",
-                        "tags": ["Computer Science"],
-                        "stipend": i.find('span', class_='stipend').get_text(strip=True) if i.find('span', class_='stipend') else "N/A"
-                    })
-                except Exception:
-                    continue
+            for card in extract_cards(content, INTERNSHALA):
+                link = card['link']
+                if not link: continue
+
+                full_link = f"https://internshala.com{link}" if link.startswith('/') else link
+                
+                results.append({
+                    "title": card['title'] or "Internship",
+                    "company": card['company'] or "Unknown",
+                    "location": card['location'] or "India",
+                    "link": full_link,
+                    "source": "Internshala",
+                    "tags": [category.replace('-', ' ').title()],
+                    "stipend": card['stipend'] or "N/A"
+                })
         except Exception as e:
             logger.error(f"Internshala failed: {e}")
         
         return results
 
-    def run_all(self):
-        internships = []
-        
-        # 1. CERN (API)
-        try:
-            logger.info("Debug: Starting CERN Scrape...")
-            # Remove string headers for API to avoid potential anti-bot checks on User-Agent
-            internships.extend(self.scrape_cern_api())
-        except Exception as e:
-            logger.error(f"CERN Scraper crashed: {e}", exc_info=True)
+    def scrape_remotive(self):
+        """Scrapes Remotive software-dev jobs via their public API"""
+        url = "https://remotive.com/api/remote-jobs?category=software-dev"
+        logger.info(f"Scraping Remotive API: {url}")
+        # On a 304 this is the cached body
+        resp = self.cache.get(url, timeout=10)
+        if resp.status_code == 200:
+            data = resp.json()
+            for job in data.get('jobs', []):
+                # Relax filter for testing
+                if "intern" in job['title'].lower():
+                    yield {
+                        "title": job['title'],
+                        "company": job['company_name'],
+                        "location": job['candidate_required_location'],
+                        "link": job['url'],
+                        "source": "Remotive",
+                        "tags": job.get('tags', []),
+                        "posted_at": job['publication_date']
+                    }
 
-        # 2. Internshala (HTML)
-        try:
-            logger.info("Debug: Starting Internshala Scrape...")
-            internships.extend(self.scrape_internshala())
-        except Exception as e:
-            logger.error(f"Internshala Scraper crashed: {e}")
+    def sources(self):
+        """(name, generator function) pairs for every source run_all and stream_all fetch."""
+        return [
+            *[(company_id, lambda company_id=company_id: self.scrape_smartrecruiters(company_id))
+              for company_id in SMARTRECRUITERS_COMPANIES],
+            ("Internshala", self.scrape_internshala),
+            ("WeWorkRemotely", lambda: self.scrape_rss("https://weworkremotely.com/categories/remote-programming-jobs.rss", "WeWorkRemotely")),
+            ("Remotive", self.scrape_remotive),
+        ]
 
-        # 3. RSS Feeds
-        try:
-             logger.info("Debug: Starting WWR Scrape...")
-             internships.extend(self.scrape_rss("https://weworkremotely.com/categories/remote-programming-jobs.rss", "WeWorkRemotely"))
-        except Exception as e:
-            logger.error(f"RSS Scraper crashed: {e}")
+    def stream_all(self, source_timeout=DEFAULT_SOURCE_TIMEOUT, run_timeout=DEFAULT_RUN_TIMEOUT):
+        """
+        Fetches every source concurrently and yields records as soon as any source
+        produces them, so processing can overlap with fetching. Records a source yielded
+        before failing or missing its deadline are kept.
+        """
+        for name, item in stream_sources(self.sources(), source_timeout=source_timeout,
+                                         run_timeout=run_timeout, health=self.health):
+            yield item
 
-        # 4. Remotive (API)
-        try:
-            logger.info("Debug: Starting Remotive Scrape...")
-            resp = requests.get("https://remotive.com/api/remote-jobs?category=software-dev", headers=self.headers, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                for job in data.get('jobs', []):
-                    # Relax filter for testing
-                    if "intern" in job['title'].lower():
-                        internships.append({
-                            "title": job['title'],
-                            "company": job['company_name'],
-                            "location": job['candidate_required_location'],
-                            "link": job['url'],
-                            "source": "Remotive",
-                            "tags": job.get('tags', []),
-                            "posted_at": job['publication_date']
-                        })
-        except Exception as e:
-             logger.error(f"Remotive failed: {e}")
+    def run_all(self, concurrent=True, source_timeout=DEFAULT_SOURCE_TIMEOUT, run_timeout=DEFAULT_RUN_TIMEOUT):
+        """
+        Fetches every source and returns the combined results.
+        In concurrent mode all sources run in parallel, each with its own deadline plus
+        an overall run deadline, so the run takes about as long as the slowest source.
+        """
+        internships = []
+
+        if concurrent:
+            for name, results in run_sources(self.sources(), source_timeout=source_timeout,
+                                             run_timeout=run_timeout, health=self.health):
+                internships.extend(results)
+        else:
+            for name, scrape in self.sources():
+                if not self.health.allow(name):
+                    logger.info(f"Source {name}: circuit open, skipping.")
+                    continue
+                try:
+                    logger.info(f"Debug: Starting {name} Scrape...")
+                    internships.extend(scrape())
+                    self.health.record_success(name)
+                except Exception as e:
+                    logger.error(f"{name} Scraper crashed: {e}", exc_info=True)
+                    self.health.record_failure(name)
+            self.health.save()
 
         logger.info(f"Total Internships Found: {len(internships)}")
         return internships
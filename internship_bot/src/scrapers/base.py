@@ -1,12 +1,30 @@
 
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Dict, Iterator, List
+try:
+    from http_client import HttpClient, get_default_client
+    from health import SourceUnavailable
+except ImportError:
+    from src.http_client import HttpClient, get_default_client
+    from src.health import SourceUnavailable
 
 class BaseScraper(ABC):
+    def __init__(self, client: HttpClient = None):
+        # Shared pooled HTTP client; falls back to the process-wide one
+        self.client = client or get_default_client()
+
     @abstractmethod
     def scrape(self) -> List[Dict]:
         """
         Scrapes internships and returns a list of dictionaries.
         Each dict must have: title, company, location, link, stipend, source.
+        Raises SourceUnavailable when the source itself could not be fetched.
         """
         pass
+
+    def stream(self) -> Iterator[Dict]:
+        """
+        Yields the same records as scrape(), as soon as they are available.
+        Scrapers that can produce records incrementally override this.
+        """
+        yield from self.scrape()
@@ -1,19 +1,29 @@
 
-import requests
 import logging
 from typing import List, Dict
-from .base import BaseScraper
+from .base import BaseScraper, SourceUnavailable
+try:
+    from http_client import HttpClient
+    from http_cache import HttpCache
+except ImportError:
+    from src.http_client import HttpClient
+    from src.http_cache import HttpCache
 
 logger = logging.getLogger(__name__)
 
 class RemotiveScraper(BaseScraper):
+    def __init__(self, client: HttpClient = None, cache: HttpCache = None):
+        super().__init__(client)
+        self.cache = cache or HttpCache(client=self.client)
+
     def scrape(self) -> List[Dict]:
         url = "https://remotive.com/api/remote-jobs?category=software-dev&search=internship"
         logger.info(f"Scraping {url}...")
         results = []
         
         try:
-            response = requests.get(url, timeout=15)
+            # On a 304 this is the cached body
+            response = self.cache.get(url, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -44,6 +54,6 @@ class RemotiveScraper(BaseScraper):
                     })
                     
         except Exception as e:
-            logger.error(f"Remotive scraping failed: {e}")
+            raise SourceUnavailable(f"Remotive scraping failed: {e}") from e
             
         return results
@@ -1,57 +1,54 @@
 
-import requests
-import xml.etree.ElementTree as ET
 import logging
-from typing import List, Dict
-from .base import BaseScraper
+from typing import Dict, Iterator, List
+from .base import BaseScraper, SourceUnavailable
+try:
+    from http_client import HttpClient
+    from http_cache import HttpCache
+    from feeds import iter_entries
+except ImportError:
+    from src.http_client import HttpClient
+    from src.http_cache import HttpCache
+    from src.feeds import iter_entries
 
 logger = logging.getLogger(__name__)
 
+CS_KEYWORDS = ['software', 'developer', 'engineer', 'data', 'web', 'intern']
+
 class RSSScraper(BaseScraper):
-    def __init__(self, url: str, source_name: str):
+    def __init__(self, url: str, source_name: str, client: HttpClient = None, cache: HttpCache = None):
+        super().__init__(client)
+        self.cache = cache or HttpCache(client=self.client)
         self.url = url
         self.source_name = source_name
 
     def scrape(self) -> List[Dict]:
+        return list(self.stream())
+
+    def stream(self) -> Iterator[Dict]:
         logger.info(f"Scraping RSS {self.url}...")
-        results = []
+        count = 0
         
         try:
-            response = requests.get(self.url, timeout=15)
+            # On a 304 this is the cached body
+            response = self.cache.get(self.url, stream=True, timeout=15)
             response.raise_for_status()
             
-            # Simple XML parsing (could be robustified with feedparser lib if added)
-            root = ET.fromstring(response.content)
-            
-            # Handle Atom or RSS 2.0
-            # Very basic assumption: 'item' tags
-            items = root.findall('.//item')
-            if not items:
-                # Try atom 'entry'
-                items = root.findall('.//{http://www.w3.org/2005/Atom}entry')
+            # Stream entries (RSS 2.0 or Atom); only titles with CS keywords become dicts
+            with response.open() as stream:
+                for entry in iter_entries(stream, keywords=CS_KEYWORDS):
+                    count += 1
+                    yield {
+                        'title': entry['title'] or "Unknown",
+                        'company': self.source_name + " Listing", # RSS often lacks structured company field
+                        'location': "Remote/Global",
+                        'link': entry['link'],
+                        'stipend': "See details",
+                        'source': self.source_name,
+                        'date': entry['published'] # Return full string for parsing
+                    }
 
-            logger.info(f"Found {len(items)} items in RSS.")
-
-            for item in items:
-                title = item.find('title').text if item.find('title') is not None else "Unknown"
-                link = item.find('link').text if item.find('link') is not None else ""
-                pubDate = item.find('pubDate').text if item.find('pubDate') is not None else ""
-                
-                # Check for CS keywords
-                if not any(k in title.lower() for k in ['software', 'developer', 'engineer', 'data', 'web', 'intern']):
-                    continue
-                
-                results.append({
-                    'title': title,
-                    'company': self.source_name + " Listing", # RSS often lacks structured company field
-                    'location': "Remote/Global",
-                    'link': link,
-                    'stipend': "See details",
-                    'source': self.source_name,
-                    'date': pubDate # Return full string for parsing
-                })
+            logger.info(f"Found {count} matching items in RSS.")
                     
         except Exception as e:
-            logger.error(f"RSS scraping failed for {self.source_name}: {e}")
-            
-        return results
+            raise SourceUnavailable(f"RSS scraping failed for {self.source_name}: {e}") from e
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+# Distinct queries kept; the least recently used is evicted first
+MAX_ENTRIES = 256
+# Seconds a result is served for at most. Inserts through Database or BulkImporter, from
+# any process, invalidate results at once; this bounds how long other writes go unseen.
+TTL = 60.0
+
+
+class SearchCache:
+    """
+    LRU + TTL cache of search results, invalidated by generation counters.
+    Every cached result belongs to a scope, (country_code, field) with None for "All",
+    whose generation the database keeps (search_generations) and bumps in the transaction
+    that adds a row to it. A result is stored with the generation its scope was at when
+    the query ran and served only while the caller still reads that generation, so an
+    insert by any process drops exactly the cached queries it could change and no others.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl: float = TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (generation, expires, value)
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, generation: int, default=None):
+        """The value stored for `key`, if it was computed at `generation` and has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Hashable, generation: int, value):
+        """Stores `value`, computed when its scope was at `generation` (read that before running the query)."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'entries': len(self._entries)}
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List
+
+try:
+    from http_client import HttpClient, get_default_client
+    from http_cache import HttpCache
+except ImportError:
+    from src.http_client import HttpClient, get_default_client
+    from src.http_cache import HttpCache
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.smartrecruiters.com/v1/companies/{company_id}/postings"
+STATE_FILE = "data/smartrecruiters_state.json"
+PAGE_SIZE = 100  # API maximum
+MAX_PARALLEL_PAGES = 4
+
+
+class SmartRecruitersClient:
+    """
+    Paginated, incremental reader for the public SmartRecruiters postings API.
+    Keeps a persisted per-company watermark: the newest `releasedDate` seen and the ids
+    released at exactly that time, so postings sharing it are not skipped. Incremental
+    fetches stop paging at the first page that reaches postings older than the watermark.
+    Postings come back newest first, so everything past that point was seen before.
+    """
+
+    def __init__(self, client: HttpClient = None, cache: HttpCache = None, state_file: str = None,
+                 page_size: int = PAGE_SIZE, max_parallel_pages: int = MAX_PARALLEL_PAGES):
+        self.client = client or get_default_client()
+        self.cache = cache
+        self.state_file = state_file or os.path.join(os.getcwd(), STATE_FILE)
+        self.page_size = page_size
+        self.max_parallel_pages = max_parallel_pages
+        self._lock = threading.Lock()
+        self.watermarks = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # Older state files kept only the date
+        return {company_id: {'date': mark, 'ids': []} if isinstance(mark, str) else mark
+                for company_id, mark in state.items()}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp = self.state_file + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.watermarks, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+    def _fetch_page(self, company_id, offset, use_cache=False):
+        url = API_URL.format(company_id=company_id)
+        params = f"?offset={offset}&limit={self.page_size}"
+        # Plain library User-Agent: a browser UA risks anti-bot checks on this API
+        headers = {'User-Agent': requests.utils.default_user_agent()}
+        if use_cache and self.cache is not None:
+            # On a 304 this is the cached body. It is still read: the run that fetched it
+            # may not have got as far as advancing the watermark.
+            r = self.cache.get(url + params, headers=headers)
+        else:
+            r = self.client.get(url + params, headers=headers)
+        r.raise_for_status()
+        return r.json()
+
+    def fetch_postings(self, company_id: str, incremental: bool = True) -> List[Dict]:
+        """List form of iter_postings."""
+        return list(self.iter_postings(company_id, incremental))
+
+    def iter_postings(self, company_id: str, incremental: bool = True) -> Iterator[Dict]:
+        """
+        Yields raw postings for `company_id` released after the stored watermark
+        (all postings when `incremental` is False), page by page as pages arrive.
+        The watermark only advances once the generator has been fully consumed.
+        """
+        with self._lock:
+            watermark = self.watermarks.get(company_id) if incremental else None
+
+        first = self._fetch_page(company_id, 0, use_cache=incremental)
+        total = first.get('totalFound', 0)
+        # Postings move to later pages as new ones are released mid-run
+        seen = set()
+        # The newest releasedDate taken and the ids released at it: the next watermark
+        newest = {'date': '', 'ids': []}
+        postings, reached_seen = self._take_new(first.get('content', []), watermark, seen)
+        self._advance(newest, postings)
+        yield from postings
+
+        offsets = list(range(self.page_size, total, self.page_size))
+        # Without a watermark every page is needed, so fetch them all at once
+        batch_size = self.max_parallel_pages if watermark else max(len(offsets), 1)
+        with ThreadPoolExecutor(max_workers=self.max_parallel_pages) as executor:
+            while offsets and not reached_seen:
+                batch, offsets = offsets[:batch_size], offsets[batch_size:]
+                pages = executor.map(lambda offset: self._fetch_page(company_id, offset), batch)
+                for page in pages:
+                    content = page.get('content', [])
+                    new, reached_seen = self._take_new(content, watermark, seen)
+                    self._advance(newest, new)
+                    yield from new
+                    if reached_seen or not content:
+                        reached_seen = True
+                        break
+
+        logger.info(f"SmartRecruiters {company_id}: {len(seen)} new postings (of {total} listed).")
+        if newest['date']:
+            with self._lock:
+                mark = self.watermarks.get(company_id) or {'date': '', 'ids': []}
+                if newest['date'] == mark['date']:
+                    newest['ids'] = sorted(set(mark['ids']) | set(newest['ids']))
+                if newest['date'] >= mark['date']:
+                    self.watermarks[company_id] = newest
+                    self._save_state()
+
+    @staticmethod
+    def _advance(newest, postings):
+        for posting in postings:
+            released = posting.get('releasedDate', '')
+            if released > newest['date']:
+                newest['date'], newest['ids'] = released, [posting.get('id')]
+            elif released == newest['date']:
+                newest['ids'].append(posting.get('id'))
+
+    @staticmethod
+    def _take_new(content, watermark, seen):
+        """
+        Splits a page into postings not seen before (released after the watermark, or at
+        it under an id not recorded there), and whether it reached postings older than it.
+        Ids already in `seen` are dropped, and the new ones added to it.
+        """
+        new = []
+        reached_seen = False
+        for posting in content:
+            released = posting.get('releasedDate', '')
+            if watermark:
+                if released < watermark['date']:
+                    reached_seen = True
+                    continue
+                if released == watermark['date'] and posting.get('id') in watermark['ids']:
+                    continue
+            if posting.get('id') in seen:
+                continue
+            seen.add(posting.get('id'))
+            new.append(posting)
+        return new, reached_seen
@@ -1,34 +1,104 @@
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import logging
+import re
 from dateutil import parser
 
 logger = logging.getLogger(__name__)
 
+# Offsets for the zone names RSS feeds actually use (RFC 822 section 5)
+_ZONES = {'UT': 0, 'UTC': 0, 'GMT': 0, 'Z': 0, 'EST': -5, 'EDT': -4, 'CST': -6, 'CDT': -5,
+          'MST': -7, 'MDT': -6, 'PST': -8, 'PDT': -7}
+_MONTHS = {m: i for i, m in enumerate(['jan', 'feb', 'mar', 'apr', 'may', 'jun',
+                                       'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+# 2024-05-01, 2024-05-01T10:00:00Z, 2024-05-01 10:00:00.123+02:00 (Remotive, CERN, LinkedIn)
+_ISO = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,9}))?)?)?'
+                  r'\s*(Z|[+-]\d{2}(?::?\d{2})?)?$', re.IGNORECASE)
+# Wed, 01 May 2024 10:00:00 +0000 / GMT (RSS pubDate)
+_RFC822 = re.compile(r'(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})\s+(\d{2}):(\d{2})(?::(\d{2}))?'
+                     r'\s*([+-]\d{4}|[A-Za-z]{1,3})?$')
+DATE_CACHE_SIZE = 4096
+
+
+def _utc_naive(dt: datetime, offset: timedelta = None) -> datetime:
+    """Converts to UTC and drops tzinfo; times without a zone are taken as UTC."""
+    if offset is not None:
+        return dt - offset
+    if dt.tzinfo:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _parse_iso(match):
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    micro = int((fraction or '0')[:6].ljust(6, '0'))
+    dt = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0), micro)
+    if not zone or zone in 'Zz':
+        return dt
+    sign = -1 if zone[0] == '-' else 1
+    digits = zone[1:].replace(':', '')
+    return _utc_naive(dt, sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:4] or 0)))
+
+
+def _parse_rfc822(match):
+    day, month, year, hour, minute, second, zone = match.groups()
+    month = _MONTHS.get(month.lower())
+    if month is None:
+        return None
+    dt = datetime(int(year), month, int(day), int(hour), int(minute), int(second or 0))
+    if not zone:
+        return dt
+    if zone[0] in '+-':
+        sign = -1 if zone[0] == '-' else 1
+        return _utc_naive(dt, sign * timedelta(hours=int(zone[1:3]), minutes=int(zone[3:5])))
+    hours = _ZONES.get(zone.upper())
+    if hours is None:
+        return None  # unknown zone name: let dateutil decide
+    return _utc_naive(dt, timedelta(hours=hours))
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_cached(date_str: str):
+    text = date_str.strip()
+    try:
+        match = _ISO.match(text)
+        if match:
+            return _parse_iso(match)
+        match = _RFC822.match(text)
+        if match:
+            dt = _parse_rfc822(match)
+            if dt is not None:
+                return dt
+    except ValueError:
+        pass  # out-of-range fields; dateutil reports those the same way
+
+    try:
+        # Anything else goes through dateutil, which is slow but very robust
+        return _utc_naive(parser.parse(text))
+    except Exception as e:
+        logger.debug(f"Could not parse date '{date_str}': {e}")
+        return None
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 def parse_date(date_str: str) -> datetime:
     """
-    Parses a date string into a datetime object.
-    Returns None if parsing fails.
+    Parses a date string into a naive datetime in UTC (zoned inputs are converted,
+    unzoned ones are taken as UTC). Returns None if parsing fails.
+    ISO-8601 and RFC-822 take a compiled fast path; anything else falls back to
+    dateutil. Results are memoized, since the same strings come up again in is_recent.
     """
     if not date_str or date_str == "N/A" or date_str == "Freshly Posted":
         # Treat "Freshly Posted" as today
         if date_str == "Freshly Posted":
-            return datetime.now()
+            return utc_now()
         return None
 
-    try:
-        # datautil.parser is very robust
-        dt = parser.parse(date_str)
-        # Ensure offset-naive for comparison (or aware, but simpler to normalize to naive UTC if strict)
-        # For simple bot logic, converting to naive local/UTC is usually fine if consistent.
-        # Let's return the datetime object directly, parser usually handles it well.
-        # If timezone aware, convert to naive for simple subtraction with datetime.now()
-        if dt.tzinfo:
-            dt = dt.replace(tzinfo=None)
-        return dt
-    except Exception as e:
-        logger.debug(f"Could not parse date '{date_str}': {e}")
-        return None
+    return _parse_cached(date_str)
 
 def is_recent(date_str: str, days: int = 7) -> bool:
     """
@@ -44,5 +114,5 @@ def is_recent(date_str: str, days: int = 7) -> bool:
         if date_str == "Freshly Posted": return True
         return False # safe default for unknown dates to avoid spamming old stuff
 
-    cutoff = datetime.now() - timedelta(days=days)
+    cutoff = utc_now() - timedelta(days=days)
     return dt >= cutoff
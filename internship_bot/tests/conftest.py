@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import modules the way the pipeline scripts do: `src.` from internship_bot/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
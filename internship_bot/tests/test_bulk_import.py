@@ -0,0 +1,55 @@
+import json
+import sqlite3
+
+import pytest
+
+from src.bulk_import import BulkImporter
+
+LINK = 'https://jobs.example.com/1'
+ITEM = {'title': 'Software Engineering Intern', 'company': 'Acme', 'location': 'Berlin, Germany',
+        'apply_link': LINK, 'source': 'Test'}
+
+
+@pytest.fixture
+def stores(tmp_path):
+    history = tmp_path / 'history.json'
+    history.write_text(json.dumps([LINK, 'https://jobs.example.com/2']))
+    items = tmp_path / 'internships.json'
+    items.write_text(json.dumps([ITEM]))
+    return str(tmp_path / 'target.db'), str(history), str(items)
+
+
+def stored(target):
+    with sqlite3.connect(target) as conn:
+        return {table: sorted(link for (link,) in conn.execute(f"SELECT link FROM {table}"))
+                for table in ('internships', 'seen_links')}
+
+
+def run(target, *sources):
+    importer = BulkImporter(target)
+    for path in sources:
+        importer.import_source(path)
+    importer.close()
+
+
+EXPECTED = {'internships': [LINK], 'seen_links': ['https://jobs.example.com/2']}
+
+
+def test_a_history_link_does_not_hide_the_full_row_imported_after_it(stores):
+    target, history, items = stores
+    run(target, history, items)
+    assert stored(target) == EXPECTED
+
+
+def test_a_history_link_from_an_earlier_run_does_not_hide_the_full_row(stores):
+    target, history, items = stores
+    run(target, history)
+    run(target, items)
+    assert stored(target) == EXPECTED
+
+
+def test_a_history_link_of_a_known_row_is_not_kept(stores):
+    target, history, items = stores
+    run(target, items, history)
+    run(target, history)
+    assert stored(target) == EXPECTED
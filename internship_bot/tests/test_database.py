@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.database import Database
+
+
+def row(n, **overrides):
+    return {'title': f'Intern {n}', 'company': 'Acme', 'location': 'Berlin, Germany', 'link': f'https://a.example/{n}',
+            'source': 'Test', 'country': 'Germany', 'field': 'Computer Science', **overrides}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'internships.db'))
+    yield db
+    db.engine.dispose()
+
+
+def test_add_internships_bulk_returns_only_new_links(db):
+    assert db.add_internships_bulk([row(1), row(2)]) == ['https://a.example/1', 'https://a.example/2']
+    assert db.add_internships_bulk([row(2), row(3)]) == ['https://a.example/3']
+
+
+def test_a_failed_batch_raises_and_stores_nothing(db):
+    with pytest.raises(IntegrityError):
+        db.add_internships_bulk([row(1), row(2, title=None)])
+    assert db.search_internships('All', 'All') == []
+
+
+def test_an_insert_by_another_instance_invalidates_cached_searches(tmp_path):
+    # Two Database instances on one file stand in for the bot and the scraper processes
+    path = str(tmp_path / 'internships.db')
+    bot, scraper = Database(path), Database(path)
+    try:
+        scraper.add_internships_bulk([row(1)])
+        assert [r.link for r in bot.search_internships('Germany', 'All')] == ['https://a.example/1']
+        assert [r.link for r in bot.full_text_search('intern')] == ['https://a.example/1']
+        assert bot.search_internships('Germany', 'All')[0].link == 'https://a.example/1'
+        assert bot.cache_stats()['hits'] == 1
+
+        scraper.add_internships_bulk([row(2)])
+        assert {r.link for r in bot.search_internships('Germany', 'All')} == {'https://a.example/1',
+                                                                             'https://a.example/2'}
+        assert len(bot.full_text_search('intern')) == 2
+        assert bot.cache_stats()['hits'] == 1
+    finally:
+        bot.engine.dispose()
+        scraper.engine.dispose()
+
+
+def test_an_insert_keeps_cached_searches_of_other_scopes(db):
+    db.add_internships_bulk([row(1)])
+    db.search_internships('France', 'All')
+    db.add_internship(row(2))
+    db.search_internships('France', 'All')
+    assert db.cache_stats()['hits'] == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from src.filters import extract_country
+from src.gazetteer import Gazetteer
+
+# Locations the word-like codes ("in", "us", "ca", "de") and US states used to misclassify
+REGRESSIONS = [
+    ('Anywhere in the world', 'Other'),
+    ('Remote - open to applicants in Europe', 'Remote'),
+    ('San Francisco, CA', 'United States'),
+    ('Paris, Île-de-France, France', 'France'),
+    ('Remote (US or Canada)', 'Canada'),
+    # US state abbreviations that are also country codes
+    ('Sunnyvale, CA', 'United States'),
+    ('Cupertino, CA', 'United States'),
+    ('Wilmington, DE', 'United States'),
+    ('Indianapolis, IN', 'United States'),
+]
+
+KNOWN = [
+    ('Remote in US', 'United States'),
+    ('remote in us', 'Remote'),
+    ('Geneva, ch', 'Switzerland'),
+    ('Berlin, DE', 'Germany'),
+    ('New York, NY, USA', 'United States'),
+    ('Toronto, Canada', 'Canada'),
+    ('Bangalore', 'India'),
+    ('Hamburg, DE, Germany', 'Germany'),
+    ('Remote, CA', 'Canada'),
+    ('Remote in IN', 'India'),
+    ('Work from home', 'Other'),
+]
+
+
+@pytest.mark.parametrize('location, country', REGRESSIONS + KNOWN)
+def test_extract_country(location, country):
+    assert extract_country(location) == country
+
+
+def test_codes_need_capitals_or_their_own_part():
+    gazetteer = Gazetteer()
+    assert gazetteer.resolve('Milan, IT') == 'IT'
+    assert gazetteer.resolve('Milan, it') == 'IT'
+    assert gazetteer.resolve('it internship, remote') is None
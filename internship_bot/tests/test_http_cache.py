@@ -0,0 +1,41 @@
+from src.http_cache import HttpCache
+
+FEED = b'<rss><channel><item><title>Intern</title></item></channel></rss>'
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def iter_content(self, size):
+        yield self.content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeClient:
+    """Serves FEED with an ETag and answers 304 when it is sent back."""
+
+    def __init__(self):
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent.append(dict(headers or {}))
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, FEED, {'ETag': '"v1"'})
+
+
+def test_not_modified_serves_the_stored_body(tmp_path):
+    client = FakeClient()
+    HttpCache(cache_dir=str(tmp_path), client=client).get('https://example.com/feed')
+
+    # A later run, e.g. after the first crashed before storing its items
+    response = HttpCache(cache_dir=str(tmp_path), client=client).get('https://example.com/feed', stream=True)
+    assert client.sent[-1]['If-None-Match'] == '"v1"'
+    assert response.not_modified
+    with response.open() as stream:
+        assert stream.read() == FEED
@@ -0,0 +1,36 @@
+from src.near_duplicates import NearDuplicateIndex, NearDuplicateStore
+
+
+def lines(path):
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def test_recurring_duplicate_is_recorded_once(tmp_path):
+    path = str(tmp_path / 'near.jsonl')
+    for _ in range(3):
+        # The same two postings from two sources, every run
+        store = NearDuplicateStore(path)
+        store.check('https://a.example/1', 'Software Engineering Intern', 'Acme Inc', location='Berlin')
+        store.confirm(['https://a.example/1'])
+        assert store.check('https://b.example/9', 'Software Engineering Internship', 'Acme', location='Berlin') \
+            == 'https://a.example/1'
+        store.save()
+    assert len(lines(path)) == 2
+
+
+def test_same_role_in_another_city_is_not_a_duplicate():
+    index = NearDuplicateIndex()
+    index.add('berlin', 'Software Engineering Intern', 'Acme', location='Berlin, Germany')
+    assert index.find('Software Engineering Intern', 'Acme', location='Munich, Germany') is None
+    assert index.find('Software Engineering Intern', 'Acme', location='Berlin') == 'berlin'
+    assert index.find('Software Engineering Intern', 'Acme') == 'berlin'
+
+
+def test_unconfirmed_postings_are_not_saved(tmp_path):
+    path = str(tmp_path / 'near.jsonl')
+    store = NearDuplicateStore(path)
+    store.check('https://a.example/1', 'Data Science Intern', 'Globex', location='Remote')
+    # The insert failed: nothing is confirmed, so the next run checks it as new again
+    store.save()
+    assert NearDuplicateStore(path).check('https://a.example/1', 'Data Science Intern', 'Globex') is None
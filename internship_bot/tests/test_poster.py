@@ -0,0 +1,63 @@
+import pytest
+
+from src.poster import Poster
+
+INTERNSHIP = {'title': 'Software Engineering Intern', 'company': 'Acme', 'location': 'Remote', 'field': 'STEM',
+              'duration': '3 months', 'stipend': 'Paid', 'requirements': [], 'deadline': 'Open',
+              'apply_link': 'https://a.example/1', 'country': 'Remote', 'logo': 'https://logo.example/acme.png'}
+
+
+class FakeResponse:
+    def __init__(self, status_code, description=''):
+        self.status_code = status_code
+        self.ok = status_code == 200
+        self.description = description
+
+    def json(self):
+        return {'ok': self.ok, 'description': self.description}
+
+
+class FakeClient:
+    """Answers sendPhoto with `photo_response` and sendMessage with 200."""
+
+    def __init__(self, photo_response):
+        self.photo_response = photo_response
+        self.calls = []
+
+    def post(self, url, json=None):
+        method = url.rsplit('/', 1)[1]
+        self.calls.append(method)
+        return self.photo_response if method == 'sendPhoto' else FakeResponse(200)
+
+
+class FakeLogos:
+    def __init__(self):
+        self.bad = []
+
+    def logo_for(self, internship):
+        return internship['logo']
+
+    def mark_bad(self, internship):
+        self.bad.append(internship['company'])
+
+
+def post(photo_response):
+    client, logos = FakeClient(photo_response), FakeLogos()
+    posted = Poster('token', '@channel', client=client, logos=logos).post_internship(INTERNSHIP)
+    return posted, client.calls, logos.bad
+
+
+@pytest.mark.parametrize('response', [FakeResponse(429, 'Too Many Requests: retry after 5'),
+                                      FakeResponse(502, 'Bad Gateway')])
+def test_transient_errors_keep_the_logo_and_skip_the_fallback(response):
+    assert post(response) == (False, ['sendPhoto'], [])
+
+
+def test_a_rejected_photo_is_marked_bad_and_sent_as_text():
+    response = FakeResponse(400, 'Bad Request: wrong file identifier/HTTP URL specified')
+    assert post(response) == (True, ['sendPhoto', 'sendMessage'], ['Acme'])
+
+
+def test_other_bad_requests_fall_back_without_blaming_the_logo():
+    response = FakeResponse(400, "Bad Request: can't parse entities")
+    assert post(response) == (True, ['sendPhoto', 'sendMessage'], [])
@@ -0,0 +1,24 @@
+import pytest
+
+import src.processor as processor_module
+from src.event_store import EventStore
+from src.processor import Processor
+
+
+def make_processor(tmp_path):
+    store = EventStore(snapshot_file=str(tmp_path / 'snapshot.json'), log_file=str(tmp_path / 'events.jsonl'),
+                       legacy_file=str(tmp_path / 'internships.json'))
+    return Processor(store)
+
+
+def test_process_batch_uses_the_batch_classification(tmp_path, monkeypatch):
+    processor = make_processor(tmp_path)
+    # Only classify_many may classify; a per-item classify() would mean the batch result was thrown away
+    monkeypatch.setattr(processor_module, 'classify', lambda *args: pytest.fail(f"classify{args} called per item"))
+    added = processor.process_batch([
+        {'title': 'Machine Learning Intern', 'company': 'Acme', 'location': 'Berlin, Germany', 'link': 'https://a.example/1'},
+        {'title': 'Software Engineering Intern', 'company': 'Globex', 'location': 'Remote', 'link': 'https://a.example/2'},
+    ])
+    assert added == 2
+    assert [item['field'] for item in processor.load_data()] == ['Data Science / AI', 'Computer Science / Engineering']
+
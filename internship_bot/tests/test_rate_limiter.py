@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+
+from src.database import Database
+from src.rate_limiter import RateLimiter
+
+# Long enough that only explicit flush() / close() calls write
+NO_BACKGROUND_FLUSH = 3600
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'internships.db'))
+    yield db
+    db.engine.dispose()
+
+
+def today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def test_requests_past_the_limit_are_refused(db):
+    limiter = RateLimiter(db, limit=3, flush_interval=NO_BACKGROUND_FLUSH)
+    try:
+        assert [limiter.check(1) for _ in range(4)] == [(True, 1), (True, 2), (True, 3), (False, 3)]
+        # Limits are per user
+        assert limiter.check(2) == (True, 1)
+    finally:
+        limiter.close()
+
+
+def test_counts_survive_a_restart(db):
+    limiter = RateLimiter(db, limit=3, flush_interval=NO_BACKGROUND_FLUSH)
+    for _ in range(3):
+        limiter.check(1)
+    limiter.close()
+
+    restarted = RateLimiter(db, limit=3, flush_interval=NO_BACKGROUND_FLUSH)
+    try:
+        assert restarted.check(1) == (False, 3)
+    finally:
+        restarted.close()
+
+
+def test_a_failed_flush_keeps_counters_dirty(db, monkeypatch):
+    limiter = RateLimiter(db, limit=3, flush_interval=NO_BACKGROUND_FLUSH)
+    try:
+        limiter.check(1)
+        limiter.check(1)
+
+        def locked(counts):
+            raise RuntimeError('database is locked')
+        monkeypatch.setattr(db, 'save_request_counts', locked)
+        limiter.flush()
+        assert limiter._dirty == {(1, today())}
+        assert db.load_request_counts(today()) == {}
+
+        monkeypatch.undo()
+        limiter.flush()
+        assert limiter._dirty == set()
+        assert db.load_request_counts(today()) == {(1, today()): 2}
+    finally:
+        limiter.close()
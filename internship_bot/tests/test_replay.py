@@ -0,0 +1,68 @@
+import base64
+import gzip
+import json
+import os
+
+import pytest
+
+import bench_pipeline
+
+RSS_URL = 'https://weworkremotely.com/categories/remote-programming-jobs.rss'
+RSS = b'''<?xml version="1.0"?>
+<rss version="2.0"><channel><title>WWR</title>
+<item><title>Acme: Software Engineering Intern</title><link>https://weworkremotely.com/jobs/1</link>
+<pubDate>Mon, 06 May 2024 10:00:00 +0000</pubDate></item>
+<item><title>Globex: Data Science Intern</title><link>https://weworkremotely.com/jobs/2</link>
+<pubDate>Mon, 06 May 2024 09:00:00 +0000</pubDate></item>
+<item><title>Initech: Senior Sales Manager</title><link>https://weworkremotely.com/jobs/3</link>
+<pubDate>Mon, 06 May 2024 08:00:00 +0000</pubDate></item>
+</channel></rss>'''
+REMOTIVE_JOBS = {'jobs': [
+    {'title': 'Backend Engineering Intern', 'company_name': 'Hooli', 'candidate_required_location': 'Germany',
+     'url': 'https://remotive.com/jobs/10', 'publication_date': '2024-05-05T12:00:00', 'tags': ['python']},
+    {'title': 'Machine Learning Intern', 'company_name': 'Umbrella', 'candidate_required_location': 'Anywhere in the world',
+     'url': 'https://remotive.com/jobs/11', 'publication_date': '2024-05-04T12:00:00', 'tags': []},
+]}
+
+# What each entry point fetches from the hosts above; every other request finds nothing
+# recorded and fails like an unreachable host, which the runner must survive.
+CASSETTES = {
+    'main_pipeline.py': [
+        (RSS_URL, 'application/rss+xml', RSS),
+        ('https://remotive.com/api/remote-jobs?category=software-dev', 'application/json',
+         json.dumps(REMOTIVE_JOBS).encode()),
+    ],
+    'main.py': [
+        (RSS_URL, 'application/rss+xml', RSS),
+        ('https://remotive.com/api/remote-jobs?category=software-dev&search=internship', 'application/json',
+         json.dumps(REMOTIVE_JOBS).encode()),
+    ],
+}
+
+
+def write_cassette(path, exchanges):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for url, content_type, body in exchanges:
+            f.write(json.dumps({'method': 'GET', 'url': url, 'body_sha1': None, 'status': 200,
+                                'headers': {'Content-Type': content_type},
+                                'body': base64.b64encode(body).decode('ascii'), 'elapsed': 0.05}) + '\n')
+
+
+def test_replay_runs_both_entry_points_offline(tmp_path):
+    for script, exchanges in CASSETTES.items():
+        write_cassette(bench_pipeline.cassette_path(str(tmp_path), script), exchanges)
+
+    timings, counts = bench_pipeline.run_round(str(tmp_path), 'replay')
+
+    # The sales role is filtered out by both pipelines; the four internships are kept
+    assert counts == {'db rows': 4, 'items kept': 4, 'posted': 4}
+    assert timings['content: WeWorkRemotely done at'] >= 0
+    assert timings['bot: WeWorkRemotely done at'] >= 0
+
+
+@pytest.mark.skipif(not all(os.path.exists(bench_pipeline.cassette_path(bench_pipeline.DEFAULT_CASSETTE_DIR, script))
+                            for _, script in bench_pipeline.PIPELINES),
+                    reason="no recorded cassettes; run `python bench_pipeline.py record`")
+def test_replay_of_the_recorded_run():
+    _, counts = bench_pipeline.run_round(bench_pipeline.DEFAULT_CASSETTE_DIR, 'replay')
+    assert counts['db rows'] > 0 and counts['items kept'] > 0
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from src.health import SourceHealth
+from src.runner import _events
+
+
+@pytest.fixture
+def health(tmp_path):
+    return SourceHealth(str(tmp_path / 'source_health.json'))
+
+
+def slowly(events, delay):
+    """Consumes `events` the way a pipeline that posts each item does."""
+    seen = []
+    for event in events:
+        seen.append(event)
+        time.sleep(delay)
+    return seen
+
+
+@pytest.mark.parametrize('queue_size', [256, 2])
+def test_a_slow_consumer_does_not_make_a_finished_source_late(health, queue_size):
+    # With a small queue the source also waits on the consumer before it can finish
+    events = _events([('A', lambda: list(range(10)))], 0.3, 60, None, health, queue_size)
+    seen = slowly(events, 0.1)
+    assert [payload for _, kind, payload in seen if kind == 'item'] == list(range(10))
+    assert seen[-1][1] == 'done'
+    assert health.records['A']['failures'] == 0
+
+
+def test_a_late_source_is_cut_off_after_its_queued_items(health):
+    def late():
+        yield 0
+        yield 1
+        time.sleep(1)
+        yield 2
+
+    seen = slowly(_events([('A', late)], 0.2, 60, None, health, 256), 0.15)
+    assert [payload for _, kind, payload in seen if kind == 'item'] == [0, 1]
+    assert seen[-1][1] == 'failed' and isinstance(seen[-1][2], TimeoutError)
+    assert health.records['A']['failures'] == 1
+
@@ -0,0 +1,59 @@
+from src.smartrecruiters import SmartRecruitersClient
+
+
+def posting(posting_id, released):
+    return {'id': posting_id, 'name': f'Intern {posting_id}', 'releasedDate': released}
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """Serves `postings` (newest first) in pages; fails on pages listed in `failing`."""
+
+    def __init__(self, postings, failing=()):
+        self.postings = postings
+        self.failing = set(failing)
+
+    def get(self, url, headers=None, **kwargs):
+        query = dict(part.split('=') for part in url.split('?', 1)[1].split('&'))
+        offset, limit = int(query['offset']), int(query['limit'])
+        if offset in self.failing:
+            raise ConnectionError(f"page at {offset} failed")
+        return FakeResponse({'totalFound': len(self.postings), 'content': self.postings[offset:offset + limit]})
+
+
+def reader(client, tmp_path):
+    return SmartRecruitersClient(client=client, state_file=str(tmp_path / 'state.json'), page_size=2)
+
+
+def test_postings_sharing_the_watermark_date_are_not_skipped(tmp_path):
+    client = FakeClient([posting('b', '2024-05-02'), posting('a', '2024-05-01')])
+    assert [p['id'] for p in reader(client, tmp_path).iter_postings('Acme')] == ['b', 'a']
+
+    # 'c' is released at the same time as 'b', after the first run read it
+    client.postings.insert(0, posting('c', '2024-05-02'))
+    assert [p['id'] for p in reader(client, tmp_path).iter_postings('Acme')] == ['c']
+
+
+def test_a_run_that_fails_midway_does_not_advance_the_watermark(tmp_path):
+    postings = [posting(str(n), f'2024-05-{10 - n:02d}') for n in range(6)]
+    client = FakeClient(postings, failing={2})
+    taken = []
+    try:
+        for p in reader(client, tmp_path).iter_postings('Acme'):
+            taken.append(p['id'])
+    except ConnectionError:
+        pass
+    assert taken == ['0', '1']
+
+    client.failing.clear()
+    assert [p['id'] for p in reader(client, tmp_path).iter_postings('Acme')] == [str(n) for n in range(6)]
@@ -32,6 +32,11 @@ def verify_db():
         if not allowed:
             print(f"Rate Check {i+1}: Blocked (Count: {count})")
             break
+
+    # 5. Search Query Plans
+    print("\nSearch Query Plans:")
+    for country, field in [('United States', 'Computer Science'), ('All', 'All')]:
+        print(f"{country} / {field}: {'; '.join(db.explain_search(country, field))}")
             
     session.close()
 